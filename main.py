@@ -1,15 +1,21 @@
 import argparse
 import os
 
-import pandas as pd
 import yaml
 
 from src.cli import CLI
+from src.dedup import deduplicate
 from src.download import PDFDownloader
 from src.filter import PaperFilter
 from src.knowledge_extractor import KnowledgeExtractor
+from src.mapping_suggestions import suggest_from_responses
+from src.merge import merge_results
+from src.multi_search import MultiQuerySearch, load_queries
+from src.normalization import normalize_file
 from src.pipeline import PaperSearchPipeline
-from src.search import PaperSearch, PaperSearcher
+from src.report import build_report
+from src.search import PaperSearch
+from src.storage import read_table
 
 
 def main():
@@ -21,40 +27,145 @@ def main():
         default="./config/config.yaml",
         help="Path to the config file",
     )
+    parser.add_argument(
+        "--batch",
+        choices=["run", "submit", "ingest"],
+        help="Extract knowledge through the batch API instead of the menu",
+    )
+    parser.add_argument(
+        "--batch-id",
+        type=str,
+        help="Batch to wait for and ingest (with --batch ingest)",
+    )
+    parser.add_argument(
+        "--queries",
+        nargs="?",
+        const="",
+        metavar="FILE",
+        help="Run many searches concurrently: one query per line in FILE, "
+        "or search.queries from the config when no file is given",
+    )
+    parser.add_argument(
+        "--pipeline",
+        nargs="?",
+        const="",
+        metavar="TERM",
+        help="Stream search -> filter -> download for TERM "
+        "(default: search.default_term) instead of the menu",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue interrupted searches from their last completed results page",
+    )
+    parser.add_argument(
+        "--merge",
+        action="store_true",
+        help="Join the LLM responses onto the search results",
+    )
+    parser.add_argument(
+        "--normalize",
+        action="store_true",
+        help="Map the merged corpus's extracted values to canonical names "
+        "using fuzzy_mappings.py",
+    )
+    parser.add_argument(
+        "--suggest-mappings",
+        action="store_true",
+        help="Cluster the values in the LLM responses and propose fuzzy mappings",
+    )
+    parser.add_argument(
+        "--report",
+        action="store_true",
+        help="Update the analysis aggregates and render the charts and report",
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="With --report, re-read the corpus even if its file looks unchanged",
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Rescan all results files and PDFs instead of trusting the status index",
+    )
     args = parser.parse_args()
 
     # Load configuration
     with open(args.config, "r") as file:
         config = yaml.safe_load(file)
 
-    all_results_file = config["output"]["all_results_file"]
+    if args.batch:
+        extractor = KnowledgeExtractor(config)
+        if args.batch == "submit":
+            extractor.submit_batch()
+        elif args.batch == "ingest":
+            if not args.batch_id:
+                parser.error("--batch ingest requires --batch-id")
+            extractor.poll_batch(args.batch_id)
+            extractor.ingest_batch(args.batch_id)
+        else:
+            extractor.run_batch()
+        return
+
+    if args.queries is not None:
+        MultiQuerySearch(config).run(load_queries(config, args.queries), args.resume)
+        return
+
+    if args.merge:
+        merge_results(config)
+        return
+
+    if args.normalize:
+        normalize_file(config)
+        return
+
+    if args.suggest_mappings:
+        suggest_from_responses(config)
+        return
+
+    if args.report:
+        build_report(config, args.rebuild)
+        return
+
+    if args.pipeline is not None:
+        search_term = args.pipeline or config["search"]["default_term"]
+        PaperSearchPipeline(config).run(search_term)
+        return
+
+    all_results_file = config["search"]["output"]
     filtered_results_file = config["output"]["filtered_results_file"]
     pdf_download_folder = config["download"]["pdf_folder"]
+    status_file = config["output"].get("status_file", "./data/status_index.json")
 
     # Initialize CLI and display current status
-    cli = CLI(all_results_file, filtered_results_file, pdf_download_folder)
-    cli.display_status()
+    cli = CLI(all_results_file, filtered_results_file, pdf_download_folder, status_file)
+    cli.display_status(verify=args.verify)
 
     # Prompt user for next action
     choice = cli.prompt_user_action()
 
     # Initialize pipeline components
-    searcher = PaperSearcher(config)
+    searcher = PaperSearch(config)
     paper_filter = PaperFilter(config)
     downloader = PDFDownloader(config)
 
     # Execute based on user choice
     if choice == "1":
-        search_term = input("Enter the search term: ").strip()
-        searcher.search_papers(search_term)
+        last_term = searcher.checkpoint.last_unfinished() if args.resume else None
+        if last_term:
+            search_term = input(f"Enter the search term [{last_term}]: ").strip()
+            search_term = search_term or last_term
+        else:
+            search_term = input("Enter the search term: ").strip()
+        searcher.search_papers(search_term, resume=args.resume)
     elif choice == "2":
         print("Filtering existing list of papers...")
-        all_papers = pd.read_csv(all_results_file).to_dict(orient="records")
-        paper_filter.filter_papers(all_papers)
+        paper_filter.filter_papers(read_table(all_results_file))
     elif choice == "3":
         print("Downloading filtered papers...")
-        filtered_papers = pd.read_csv(filtered_results_file).to_dict(orient="records")
-        downloader.download_pdfs(filtered_papers)
+        filtered_papers = read_table(filtered_results_file).to_dict(orient="records")
+        downloader.download_pdfs(deduplicate(filtered_papers, config))
     elif choice == "4":
         print("Exiting the tool. Goodbye!")
         return
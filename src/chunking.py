@@ -0,0 +1,179 @@
+import json
+import re
+
+try:
+    import tiktoken
+except ImportError:  # Optional: fall back to a character-based estimate
+    tiktoken = None
+
+from src.rate_limiter import estimate_tokens
+
+_ENCODING = None
+
+# Numbered ("3.1 Results", "IV. DISCUSSION") or well-known unnumbered headings
+SECTION_HEADING = re.compile(
+    r"^[ \t]*(?:(?:\d+(?:\.\d+)*\.?|[IVX]+\.)[ \t]+[A-Z][^\n]{0,80}"
+    r"|(?:abstract|introduction|related work|background|methodology|methods?"
+    r"|experiments?|results|discussion|conclusions?)[ \t]*:?)[ \t]*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+BIBLIOGRAPHY_HEADING = re.compile(
+    r"^[ \t]*(?:\d+\.?[ \t]+)?"
+    r"(?:references|bibliography|works cited|literature cited)[ \t]*:?[ \t]*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+APPENDIX_HEADING = re.compile(
+    r"^[ \t]*(?:appendix|appendices)\b[^\n]{0,80}$", re.IGNORECASE | re.MULTILINE
+)
+
+
+def count_tokens(text):
+    """Count tokens with tiktoken when it is installed, otherwise estimate."""
+    global _ENCODING
+    if tiktoken is None:
+        return estimate_tokens(text)
+    if _ENCODING is None:
+        _ENCODING = tiktoken.get_encoding("o200k_base")
+    return len(_ENCODING.encode(text, disallowed_special=()))
+
+
+def strip_bibliography(text):
+    """
+    Remove the bibliography block(s) from a paper's text.
+
+    Everything from a References/Bibliography heading up to the next appendix
+    heading (or the end of the text) is dropped.
+    """
+    while True:
+        match = None
+        for match in BIBLIOGRAPHY_HEADING.finditer(text):
+            pass
+        # Only the last heading counts, so a "References" line early in the
+        # paper (e.g. in a table of contents) does not swallow the body
+        if match is None or match.start() < len(text) // 3:
+            return text
+        appendix = APPENDIX_HEADING.search(text, match.end())
+        end = appendix.start() if appendix else len(text)
+        text = text[: match.start()] + text[end:]
+
+
+def split_sections(text):
+    """Split text into sections at heading lines, keeping each heading with its body."""
+    starts = [match.start() for match in SECTION_HEADING.finditer(text)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    starts.append(len(text))
+    sections = [text[start:end] for start, end in zip(starts, starts[1:])]
+    return [section for section in sections if section.strip()]
+
+
+def _split_oversized(section, max_tokens):
+    """Break a section that alone exceeds `max_tokens` into paragraph-sized pieces."""
+    pieces = []
+    for paragraph in re.split(r"\n\s*\n", section):
+        if count_tokens(paragraph) <= max_tokens:
+            pieces.append(paragraph)
+            continue
+        # Paragraph is still too long: cut it into fixed character windows
+        window = max(1, len(paragraph) * max_tokens // count_tokens(paragraph))
+        pieces.extend(
+            paragraph[start : start + window]
+            for start in range(0, len(paragraph), window)
+        )
+    return pieces
+
+
+def chunk_text(text, max_tokens):
+    """
+    Split a paper into chunks of at most `max_tokens` tokens along section lines.
+
+    The bibliography is stripped first; consecutive sections are then packed
+    together greedily so most papers still fit in a single chunk.
+
+    Args:
+    - text (str): Text extracted from the PDF.
+    - max_tokens (int): Token budget for the paper text in one request.
+
+    Returns:
+    - list[str]: Chunks in document order.
+    """
+    text = strip_bibliography(text)
+    if count_tokens(text) <= max_tokens:
+        return [text]
+
+    pieces = []
+    for section in split_sections(text):
+        if count_tokens(section) <= max_tokens:
+            pieces.append(section)
+        else:
+            pieces.extend(_split_oversized(section, max_tokens))
+
+    chunks = []
+    current, current_tokens = [], 0
+    for piece in pieces:
+        piece_tokens = count_tokens(piece)
+        if current and current_tokens + piece_tokens > max_tokens:
+            chunks.append("\n\n".join(current))
+            current, current_tokens = [], 0
+        current.append(piece)
+        current_tokens += piece_tokens
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def _is_empty(value):
+    return value is None or value == "" or value == [] or value == {}
+
+
+def _merge_value(template, values):
+    """Merge the values chunks reported for one field, shaped like `template`."""
+    present = [value for value in values if not _is_empty(value)]
+    if isinstance(template, dict):
+        dicts = [value for value in present if isinstance(value, dict)]
+        return merge_into_schema(template, dicts)
+    if isinstance(template, list):
+        merged, seen = [], set()
+        for value in present:
+            for item in value if isinstance(value, list) else [value]:
+                key = json.dumps(item, sort_keys=True, default=str).lower()
+                if key not in seen:
+                    seen.add(key)
+                    merged.append(item)
+        return merged
+    # Single-value field: the first chunk that knows it wins (title, year, ...)
+    return present[0] if present else template
+
+
+def merge_into_schema(schema, partials):
+    """
+    Deterministically merge partial JSON objects from several chunks.
+
+    Single-value fields take the first non-empty value in chunk order, list
+    fields are concatenated without duplicates, and nested objects are merged
+    recursively. Fields outside the schema are kept after the schema fields.
+
+    Args:
+    - schema (dict): Empty response skeleton, e.g. `RESPONSE_SCHEMA`.
+    - partials (list[dict]): Parsed responses in chunk order.
+
+    Returns:
+    - dict: The merged response.
+    """
+    merged = {}
+    for field, template in schema.items():
+        merged[field] = _merge_value(template, [p.get(field) for p in partials])
+
+    for partial in partials:
+        for field in partial:
+            if field not in merged:
+                values = [p.get(field) for p in partials]
+                sample = next((value for value in values if not _is_empty(value)), None)
+                if isinstance(sample, list):
+                    template = []
+                elif isinstance(sample, dict):
+                    template = {}
+                else:
+                    template = None
+                merged[field] = _merge_value(template, values)
+    return merged
@@ -1,40 +1,39 @@
-import os
-
-import pandas as pd
+from src.status_index import StatusIndex
 
 
 class CLI:
-    def __init__(self, all_results_file, filtered_results_file, pdf_download_folder):
+    def __init__(
+        self, all_results_file, filtered_results_file, pdf_download_folder, status_file
+    ):
         self.all_results_file = all_results_file
         self.filtered_results_file = filtered_results_file
         self.pdf_download_folder = pdf_download_folder
-
-    def count_papers(self):
-        """Count the number of papers in each stage."""
-        all_results_count = 0
-        filtered_results_count = 0
-        downloaded_files_count = 0
-
-        # Count all results
-        if os.path.exists(self.all_results_file):
-            all_results_count = len(pd.read_csv(self.all_results_file))
-
-        # Count filtered results
-        if os.path.exists(self.filtered_results_file):
-            filtered_results_count = len(pd.read_csv(self.filtered_results_file))
-
-        # Count downloaded PDFs
-        if os.path.exists(self.pdf_download_folder):
-            downloaded_files_count = len(
-                [f for f in os.listdir(self.pdf_download_folder) if f.endswith(".pdf")]
-            )
-
-        return all_results_count, filtered_results_count, downloaded_files_count
-
-    def display_status(self):
+        self.status = StatusIndex(status_file)
+
+    def rescan(self):
+        """Recount every stage from the files on disk and rewrite the status index."""
+        self.status.record("search_results", self.all_results_file)
+        self.status.record("filtered_results", self.filtered_results_file)
+        self.status.record_folder("papers", self.pdf_download_folder, ".pdf")
+
+    def count_papers(self, verify=False):
+        """
+        Count the number of papers in each stage.
+
+        The counts come from the status index that each stage keeps up to date.
+        The files are only rescanned with `verify`, or when a stage is not indexed yet.
+        """
+        stages = ("search_results", "filtered_results", "papers")
+        index = self.status.load()
+        if verify or any(stage not in index for stage in stages):
+            self.rescan()
+            index = self.status.load()
+        return tuple(index[stage]["count"] for stage in stages)
+
+    def display_status(self, verify=False):
         """Display the status of papers in each stage."""
         all_results_count, filtered_results_count, downloaded_files_count = (
-            self.count_papers()
+            self.count_papers(verify)
         )
         print("\n--- Current Status ---")
         print(f"1. Papers retrieved in all_results.csv: {all_results_count}")
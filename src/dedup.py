@@ -0,0 +1,206 @@
+import re
+import threading
+import zlib
+
+import numpy as np
+
+# Largest prime below 2**32, so (a * x + b) stays within uint64 for 32-bit hashes
+_PRIME = np.uint64(4294967291)
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+_WHITESPACE = re.compile(r"\s+")
+_DOI = re.compile(r"\b(10\.\d{4,9}/[^\s\"'<>?#]+)", re.IGNORECASE)
+_ARXIV = re.compile(r"arxiv\.org/(?:abs|pdf)/(\d{4}\.\d{4,5})", re.IGNORECASE)
+
+# Only the start of the abstract is used: Scholar snippets are its first lines
+ABSTRACT_WORDS = 50
+
+
+def normalize_text(text):
+    """Casefold and drop punctuation so formatting differences do not matter."""
+    if not isinstance(text, str):
+        return ""
+    text = _NON_WORD.sub(" ", text.casefold())
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def _missing(value):
+    return value is None or value == "" or value == "N/A" or value != value
+
+
+def exact_keys(record):
+    """
+    Keys that identify a paper exactly: DOI, arXiv ID, URL and normalized title.
+
+    Returns:
+    - list[str]: Prefixed keys such as "doi:10.1000/xyz".
+    """
+    keys = []
+    url = record.get("URL")
+    url = url if isinstance(url, str) else ""
+    for text in (record.get("DOI"), url):
+        if isinstance(text, str):
+            match = _DOI.search(text)
+            if match:
+                keys.append(f"doi:{match.group(1).lower().rstrip('.')}")
+    arxiv = _ARXIV.search(url)
+    if arxiv:
+        keys.append(f"arxiv:{arxiv.group(1)}")
+    if url:
+        normalized = re.sub(r"^[a-z]+://(www\.)?", "", url.strip().lower())
+        keys.append(f"url:{normalized.split('#')[0].rstrip('/')}")
+    title = normalize_text(record.get("Title"))
+    if title:
+        keys.append(f"title:{title}")
+    return list(dict.fromkeys(keys))
+
+
+def shingles(record, size=4):
+    """
+    Shingle a paper: character n-grams of the title plus word 3-grams of the
+    start of the abstract.
+    """
+    title = normalize_text(record.get("Title"))
+    grams = {f"t:{title[i : i + size]}" for i in range(max(0, len(title) - size + 1))}
+    words = normalize_text(record.get("Abstract")).split()[:ABSTRACT_WORDS]
+    grams.update(f"a:{' '.join(words[i : i + 3])}" for i in range(len(words) - 2))
+    return grams
+
+
+def merge_records(canonical, duplicate):
+    """
+    Merge a duplicate into the canonical record, in place.
+
+    Missing fields are filled from the duplicate, and a direct PDF link
+    replaces a landing-page URL so the download has the best chance to succeed.
+    """
+    for field, value in duplicate.items():
+        if _missing(canonical.get(field)) and not _missing(value):
+            canonical[field] = value
+    url, other_url = canonical.get("URL"), duplicate.get("URL")
+    if (
+        isinstance(other_url, str)
+        and other_url.lower().endswith(".pdf")
+        and not (isinstance(url, str) and url.lower().endswith(".pdf"))
+    ):
+        canonical["URL"] = other_url
+    return canonical
+
+
+class Deduplicator:
+    """
+    Incremental near-duplicate detector for search results.
+
+    A paper is a duplicate if it shares a DOI, arXiv ID, URL or normalized
+    title with a paper already added, or if the MinHash estimate of the
+    Jaccard similarity of their shingles reaches `threshold`. Only papers with
+    abstract text take part in the MinHash comparison: titles alone cannot
+    tell "... Part I" from "... Part II" or "... for IoT" from "... for SDN".
+    Candidates for
+    the MinHash comparison come from an LSH index (`bands` bands of
+    `num_perm / bands` rows), so each add costs about the same no matter how
+    many papers have been seen. Safe to share between threads.
+    """
+
+    def __init__(self, threshold=0.8, num_perm=128, bands=32, seed=1):
+        if num_perm % bands:
+            raise ValueError("dedup.num_perm must be a multiple of dedup.bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_PRIME), num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), num_perm, dtype=np.uint64)
+
+        self.records = []
+        self.duplicates = 0
+        self._signatures = []
+        self._exact = {}
+        self._buckets = [{} for _ in range(bands)]
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        dedup_config = config.get("dedup", {})
+        return cls(
+            dedup_config.get("threshold", 0.8),
+            dedup_config.get("num_perm", 128),
+            dedup_config.get("bands", 32),
+        )
+
+    def signature(self, record):
+        """Return the MinHash signature of a record, or None if it has no abstract."""
+        grams = shingles(record)
+        if not any(gram.startswith("a:") for gram in grams):
+            return None
+        hashes = np.fromiter(
+            (zlib.crc32(gram.encode("utf-8")) for gram in grams),
+            dtype=np.uint64,
+            count=len(grams),
+        )
+        return ((np.outer(self._a, hashes) + self._b[:, None]) % _PRIME).min(axis=1)
+
+    def _band_keys(self, signature):
+        return [
+            signature[band * self.rows : (band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        ]
+
+    def _find(self, keys, signature, band_keys):
+        for key in keys:
+            if key in self._exact:
+                return self._exact[key]
+        if signature is None:
+            return None
+        candidates = set()
+        for bucket, band_key in zip(self._buckets, band_keys):
+            candidates.update(bucket.get(band_key, ()))
+        best, best_similarity = None, self.threshold
+        for index in sorted(candidates):
+            similarity = float(np.mean(self._signatures[index] == signature))
+            if similarity >= best_similarity:
+                best, best_similarity = index, similarity
+        return best
+
+    def add(self, record):
+        """
+        Add a record, merging it into its canonical record if it is a duplicate.
+
+        Returns:
+        - tuple: (canonical record, True if the record is new).
+        """
+        keys = exact_keys(record)
+        signature = self.signature(record)
+        band_keys = self._band_keys(signature) if signature is not None else []
+        with self._lock:
+            index = self._find(keys, signature, band_keys)
+            if index is not None:
+                self.duplicates += 1
+                canonical = merge_records(self.records[index], record)
+                for key in keys:
+                    self._exact.setdefault(key, index)
+                return canonical, False
+
+            index = len(self.records)
+            self.records.append(record)
+            self._signatures.append(signature)
+            for key in keys:
+                self._exact.setdefault(key, index)
+            for bucket, band_key in zip(self._buckets, band_keys):
+                bucket.setdefault(band_key, []).append(index)
+            return record, True
+
+
+def deduplicate(records, config):
+    """
+    Collapse duplicate papers in a list of records.
+
+    Returns:
+    - list[dict]: One canonical (merged) record per paper, in first-seen order.
+    """
+    deduplicator = Deduplicator.from_config(config)
+    for record in records:
+        deduplicator.add(dict(record))
+    if deduplicator.duplicates:
+        print(f"Merged {deduplicator.duplicates} duplicate papers.")
+    return deduplicator.records
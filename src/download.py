@@ -1,42 +1,250 @@
+import hashlib
 import os
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from src.manifest import DownloadManifest
+from src.status_index import StatusIndex
+
+PDF_MAGIC = b"%PDF"
+PDF_CONTENT_TYPES = {
+    "application/pdf",
+    "application/x-pdf",
+    "application/octet-stream",
+    "binary/octet-stream",
+}
+
+
+def save_pdf_response(
+    response, file_path, max_bytes=None, chunk_size=64 * 1024, offset=0
+):
+    """
+    Stream a PDF response to disk without buffering it in memory.
+
+    The body is copied chunk by chunk into `<file_path>.part` and only renamed
+    onto `file_path` once it has been fully written and validated. Bodies that
+    fail validation are deleted; a transfer interrupted by a network error keeps
+    its part file so it can be resumed with an HTTP Range request.
+
+    Args:
+    - response (requests.Response): Response opened with `stream=True`.
+    - file_path (str): Final location of the PDF.
+    - max_bytes (int): Abort once the file grows past this size (None = no limit).
+    - chunk_size (int): Number of bytes read per chunk.
+    - offset (int): Bytes already present in the part file when resuming a
+      `206 Partial Content` response; the body is appended after them.
+
+    Returns:
+    - tuple: (total file size in bytes, SHA-256 hex digest of the file).
+    """
+    content_type = response.headers.get("Content-Type", "")
+    content_type = content_type.split(";")[0].strip().lower()
+    if content_type and content_type not in PDF_CONTENT_TYPES:
+        response.close()
+        raise ValueError(f"Unexpected Content-Type '{content_type}'.")
+
+    content_length = response.headers.get("Content-Length")
+    if max_bytes and content_length and offset + int(content_length) > max_bytes:
+        response.close()
+        raise ValueError(f"PDF is larger than the {max_bytes} byte limit.")
+
+    part_path = f"{file_path}.part"
+    digest = hashlib.sha256()
+    written = offset
+    try:
+        if offset:
+            # Re-hash the bytes we already have so the checksum covers the file
+            with open(part_path, "rb") as existing:
+                for chunk in iter(lambda: existing.read(chunk_size), b""):
+                    digest.update(chunk)
+
+        with open(part_path, "ab" if offset else "wb") as file:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                if not chunk:
+                    continue
+                if written == 0 and not chunk.startswith(PDF_MAGIC):
+                    raise ValueError("Response body is not a PDF (no %PDF header).")
+                written += len(chunk)
+                if max_bytes and written > max_bytes:
+                    raise ValueError(f"PDF is larger than the {max_bytes} byte limit.")
+                digest.update(chunk)
+                file.write(chunk)
+        if written == 0:
+            raise ValueError("Response body is empty.")
+        os.replace(part_path, file_path)
+    except ValueError:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+    finally:
+        response.close()
+    return written, digest.hexdigest()
 
 
 class PDFDownloader:
     def __init__(self, config):
-        self.pdf_folder = config["download"]["pdf_folder"]
+        download_config = config["download"]
+        self.pdf_folder = download_config["pdf_folder"]
+        self.timeout = download_config.get("timeout", 30)
+        self.max_workers = download_config.get("max_workers", 1)
+        self.per_host_limit = download_config.get("per_host_limit", 2)
+        self.max_bytes = download_config.get("max_size_mb", 50) * 1024 * 1024
+        self.chunk_size = download_config.get("chunk_size_kb", 64) * 1024
+        self.revalidate = download_config.get("revalidate", False)
+        self.manifest = DownloadManifest(
+            download_config.get("manifest_file", "./data/download_manifest.sqlite")
+        )
+        self.status = StatusIndex(
+            config["output"].get("status_file", "./data/status_index.json")
+        )
+
+        # Shared session so connections are pooled and reused across papers
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.max_workers, pool_maxsize=self.max_workers
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # One semaphore per host caps how many requests hit the same server
+        self._host_locks = defaultdict(
+            lambda: threading.BoundedSemaphore(self.per_host_limit)
+        )
+        self._host_locks_guard = threading.Lock()
+
+    def _host_semaphore(self, url):
+        """Return the concurrency semaphore for the host serving `url`."""
+        host = urlparse(url).netloc.lower()
+        with self._host_locks_guard:
+            return self._host_locks[host]
+
+    def download_paper(self, paper):
+        """
+        Download a single paper's PDF, reusing whatever an earlier run left behind.
+
+        Completed files recorded in the manifest are skipped (or revalidated with
+        a conditional request when `download.revalidate` is set), and partial
+        files are resumed with an HTTP Range request.
+
+        Returns:
+        - str: "downloaded" or "skipped".
+        """
+        url = paper.get("URL", "N/A")
+        title = paper.get("Title", "N/A")
+        if url == "N/A":
+            raise ValueError("No URL provided.")
+
+        paper_id = paper.get("paper_id") or title
+        file_path = os.path.join(self.pdf_folder, f"{title}.pdf")
+        part_path = f"{file_path}.part"
+        entry = self.manifest.get(paper_id)
+
+        headers = {}
+        offset = 0
+        if self.manifest.is_complete(paper_id, file_path) and entry["url"] == url:
+            if not self.revalidate:
+                return "skipped"
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        elif entry and entry["url"] == url and os.path.exists(part_path):
+            offset = os.path.getsize(part_path)
+            if offset:
+                headers["Range"] = f"bytes={offset}-"
+                # Only resume if the remote file is unchanged since the first attempt
+                validator = entry["etag"] or entry["last_modified"]
+                if validator:
+                    headers["If-Range"] = validator
+
+        with self._host_semaphore(url):
+            response = self.session.get(
+                url, stream=True, timeout=self.timeout, headers=headers
+            )
+            if response.status_code == 304:
+                response.close()
+                return "skipped"
+            response.raise_for_status()
+            if response.status_code != 206:
+                offset = 0
+
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            self.manifest.update(
+                paper_id,
+                url=url,
+                file_path=file_path,
+                etag=etag,
+                last_modified=last_modified,
+                status="partial",
+            )
+            previous_size = (
+                os.path.getsize(file_path) if os.path.exists(file_path) else None
+            )
+            try:
+                size, sha256 = save_pdf_response(
+                    response, file_path, self.max_bytes, self.chunk_size, offset=offset
+                )
+            except ValueError:
+                self.manifest.update(paper_id, status="failed")
+                raise
+
+        self.manifest.update(paper_id, size=size, sha256=sha256, status="completed")
+        # A replaced file changes the folder's size but not its file count
+        self.status.increment(
+            "papers",
+            0 if previous_size is not None else 1,
+            size=size - (previous_size or 0),
+            path=self.pdf_folder,
+            suffix=".pdf",
+        )
+        return "downloaded"
+
+    def _download_with_log(self, index, total_papers, paper):
+        """Download one paper and print its progress line."""
+        title = paper.get("Title", "N/A")
+        try:
+            status = self.download_paper(paper)
+        except Exception as e:
+            print(f"[{index}/{total_papers}] Failed to download {title}: {e}")
+            return "failed"
+
+        if status == "skipped":
+            print(f"[{index}/{total_papers}] Already downloaded: {title}")
+        else:
+            print(f"[{index}/{total_papers}] Successfully downloaded: {title}")
+        return status
 
     def download_pdfs(self, papers):
         """Download PDFs for filtered papers with progress tracking."""
         os.makedirs(self.pdf_folder, exist_ok=True)
         total_papers = len(papers)
-        downloaded_count = 0
-        failed_count = 0
 
-        for index, paper in enumerate(papers, start=1):
-            url = paper.get("URL", "N/A")
-            title = paper.get("Title", "N/A")
-            if url == "N/A":
-                print(f"[{index}/{total_papers}] Skipping {title}: No URL provided.")
-                failed_count += 1
-                continue
+        jobs = [
+            (index, total_papers, paper)
+            for index, paper in enumerate(papers, start=1)
+        ]
+        if self.max_workers > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                results = list(
+                    executor.map(lambda job: self._download_with_log(*job), jobs)
+                )
+        else:
+            results = [self._download_with_log(*job) for job in jobs]
 
-            try:
-                response = requests.get(url, stream=True)
-                response.raise_for_status()
-                file_path = os.path.join(self.pdf_folder, f"{title}.pdf")
-                with open(file_path, "wb") as file:
-                    file.write(response.content)
-                downloaded_count += 1
-                print(f"[{index}/{total_papers}] Successfully downloaded: {title}")
-            except Exception as e:
-                failed_count += 1
-                print(f"[{index}/{total_papers}] Failed to download {title}: {e}")
+        downloaded_count = results.count("downloaded")
+        skipped_count = results.count("skipped")
+        failed_count = results.count("failed")
 
         # Summary log
         print("\n--- Download Summary ---")
         print(f"Total papers: {total_papers}")
         print(f"Successfully downloaded: {downloaded_count}")
+        print(f"Already downloaded: {skipped_count}")
         print(f"Failed downloads: {failed_count}")
         print("------------------------")
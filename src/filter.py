@@ -1,25 +1,260 @@
+import argparse
+import random
+import re
+import time
+
+import numpy as np
 import pandas as pd
 
-from src.utils import save_to_csv
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # Optional: pandas string methods are used instead
+    pa = None
+
+from src.keyword_matcher import KeywordMatcher, evaluate_expression
+from src.status_index import StatusIndex
+from src.storage import append_records
+
+# Whether `keyword_mask` runs on RE2, which needs its own pattern sources
+RE2 = pa is not None
+
+
+def _as_strings(texts):
+    """Missing values become empty strings so every row can be matched."""
+    return texts.fillna("").astype(str)
+
+
+def keyword_mask(texts, pattern):
+    """
+    Return a boolean mask of the texts matching a regex, case-insensitively.
+
+    The whole column is scanned once: by Arrow's RE2 engine when pyarrow is
+    installed, otherwise by pandas.
+
+    Args:
+    - texts (pandas.Series): Text column.
+    - pattern (str): Regex source for the engine in use, e.g.
+      `KeywordMatcher.any_pattern(field, re2=RE2)`, or None to match nothing.
+
+    Returns:
+    - numpy.ndarray: One bool per row.
+    """
+    if pattern is None:
+        return np.zeros(len(texts), dtype=bool)
+    if RE2:
+        array = pa.array(_as_strings(texts), type=pa.string())
+        mask = pc.match_substring_regex(array, pattern, ignore_case=True)
+        return mask.to_numpy(zero_copy_only=False)
+    return _as_strings(texts).str.contains(pattern, flags=re.IGNORECASE).to_numpy()
+
+
+def _join_matches(keywords, masks):
+    """
+    Join the keywords found in each row.
+
+    Args:
+    - keywords (list[str]): Keywords, in the order they are listed.
+    - masks (numpy.ndarray): One row per paper and one bool column per keyword.
+
+    Returns:
+    - list[str]: Comma-separated matched keywords per row.
+    """
+    keywords = np.array(keywords, dtype=object)
+    return [", ".join(keywords[row]) for row in masks]
+
+
+def loop_filter(papers, keywords_title, keywords_abstract):
+    """Reference per-row implementation the vectorized filter is benchmarked against."""
+    filtered = []
+    for paper in papers:
+        title = paper["Title"].lower()
+        abstract = paper["Abstract"].lower()
+
+        if any(kw in title for kw in keywords_title) or any(
+            kw in abstract for kw in keywords_abstract
+        ):
+            filtered.append(paper)
+    return filtered
 
 
 class PaperFilter:
     def __init__(self, config):
         self.filtered_results_file = config["output"]["filtered_results_file"]
-        self.keywords_title = config["filter"]["keywords"]["title"]
-        self.keywords_abstract = config["filter"]["keywords"]["abstract"]
+        self.status = StatusIndex(
+            config["output"].get("status_file", "./data/status_index.json")
+        )
+        self.matcher = KeywordMatcher.from_config(config)
+
+    def _field_columns(self, df):
+        """Map the matcher's fields (e.g. "title") to the DataFrame's columns."""
+        columns = {str(column).lower(): column for column in df.columns}
+        return {
+            field: columns[field] for field in self.matcher.keywords if field in columns
+        }
+
+    def keyword_mask(self, df):
+        """
+        Return the mask of rows accepted by the keyword matcher.
+
+        Each column is scanned once with all of its keywords compiled into a
+        single pattern, so the cost grows linearly with the number of rows. A
+        boolean expression is evaluated as one scan per term.
+        """
+        field_columns = self._field_columns(df)
+        if self.matcher.expression is None:
+            mask = np.zeros(len(df), dtype=bool)
+            for field, column in field_columns.items():
+                mask |= keyword_mask(df[column], self.matcher.any_pattern(field, RE2))
+            return mask
+
+        def term_mask(term):
+            pattern = self.matcher.term_pattern(term, RE2)
+            mask = np.zeros(len(df), dtype=bool)
+            for column in field_columns.values():
+                mask |= keyword_mask(df[column], pattern)
+            return mask
+
+        return evaluate_expression(
+            self.matcher.expression,
+            term_mask,
+            all_of=lambda masks: np.logical_and.reduce(masks),
+            any_of=lambda masks: np.logical_or.reduce(masks),
+            negate=np.logical_not,
+        )
+
+    def filter_frame(self, df):
+        """
+        Filter a DataFrame of papers by keywords in title or abstract.
+
+        Args:
+        - df (pandas.DataFrame): Papers with "Title" and "Abstract" columns.
+
+        Returns:
+        - pandas.DataFrame: Matching rows, with "<Field> Keywords Matched" columns
+          per field (e.g. "Title Keywords Matched") and a combined
+          "Keywords Matched" column.
+        """
+        filtered = df[self.keyword_mask(df)].copy()
+        # Only the matching rows are scanned again, once per keyword, to list
+        # the keywords each of them contains
+        found = {}
+        for field, column in self._field_columns(filtered).items():
+            keywords = sorted(self.matcher.keywords[field])
+            masks = np.zeros((len(filtered), len(keywords)), dtype=bool)
+            for position, kw in enumerate(keywords):
+                masks[:, position] = keyword_mask(
+                    filtered[column], self.matcher.term_pattern(kw, RE2)
+                )
+                found[kw] = found.get(kw, False) | masks[:, position]
+            filtered[f"{column} Keywords Matched"] = _join_matches(keywords, masks)
+
+        keywords = sorted(found)
+        masks = np.zeros((len(filtered), len(keywords)), dtype=bool)
+        for position, kw in enumerate(keywords):
+            masks[:, position] = found[kw]
+        filtered["Keywords Matched"] = _join_matches(keywords, masks)
+        return filtered
 
     def filter_papers(self, papers):
-        """Filter papers by keywords in title or abstract."""
-        filtered = []
-        for paper in papers:
-            title = paper["Title"].lower()
-            abstract = paper["Abstract"].lower()
-
-            if any(kw in title for kw in self.keywords_title) or any(
-                kw in abstract for kw in self.keywords_abstract
-            ):
-                filtered.append(paper)
-
-        save_to_csv(filtered, self.filtered_results_file)
+        """
+        Filter papers by keywords in title or abstract.
+
+        Args:
+        - papers: A list of dicts, a pandas DataFrame or a pyarrow Table.
+
+        Returns:
+        - list[dict]: The matching papers.
+        """
+        if hasattr(papers, "to_pandas"):
+            df = papers.to_pandas()
+        elif isinstance(papers, pd.DataFrame):
+            df = papers
+        else:
+            df = pd.DataFrame(list(papers))
+        if df.empty:
+            return []
+
+        filtered = self.filter_frame(df).to_dict(orient="records")
+        append_records(filtered, self.filtered_results_file)
+        if filtered:
+            self.status.increment(
+                "filtered_results", len(filtered), path=self.filtered_results_file
+            )
         return filtered
+
+
+def _synthetic_papers(rows, hit_rate=0.05, seed=0):
+    """Generate random titles/abstracts; about `hit_rate` of them hold a keyword."""
+    rng = random.Random(seed)
+    vocabulary = [
+        "".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(3, 10)))
+        for _ in range(5000)
+    ]
+    keywords = ["three", "3", "3wd", "twd"]
+
+    def text(length):
+        words = rng.choices(vocabulary, k=length)
+        if rng.random() < hit_rate:
+            words[rng.randrange(length)] = rng.choice(keywords)
+        return " ".join(words)
+
+    return [{"Title": text(12).title(), "Abstract": text(40)} for _ in range(rows)]
+
+
+def benchmark(rows=100_000, repeat=3):
+    """
+    Time the vectorized filter against the per-row loop on synthetic data.
+
+    Nothing is written to disk; both implementations must select the same rows.
+    """
+    keywords = ["three", "3", "3wd", "twd"]
+    # Substring mode reproduces the loop's `kw in text` semantics
+    config = {
+        "output": {"filtered_results_file": None},
+        "search": {
+            "filter": {
+                "keywords": {"title": keywords, "abstract": keywords},
+                "mode": "substring",
+            }
+        },
+    }
+    paper_filter = PaperFilter(config)
+    papers = _synthetic_papers(rows)
+    df = pd.DataFrame(papers)
+
+    def best_of(func):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            timings.append(time.perf_counter() - start)
+        return min(timings), result
+
+    # The menu used to turn the DataFrame into dicts before looping over them
+    records_time, _ = best_of(
+        lambda: loop_filter(df.to_dict(orient="records"), keywords, keywords)
+    )
+    loop_time, loop_result = best_of(lambda: loop_filter(papers, keywords, keywords))
+    vector_time, vector_result = best_of(lambda: paper_filter.filter_frame(df))
+    assert len(loop_result) == len(vector_result), "Implementations disagree"
+
+    engine = "pyarrow" if RE2 else "pandas"
+    print(f"Rows: {rows}, matched: {len(vector_result)}, engine: {engine}")
+    for label, seconds in (
+        ("Loop incl. to_dict", records_time),
+        ("Loop over dicts", loop_time),
+        ("Vectorized", vector_time),
+    ):
+        print(
+            f"{label + ':':<20}{seconds:.3f}s ({rows / seconds:,.0f} rows/s, "
+            f"{records_time / seconds:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the keyword filter")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    benchmark(args.rows, args.repeat)
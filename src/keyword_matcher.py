@@ -0,0 +1,289 @@
+import re
+
+MODES = ("substring", "word", "phrase")
+
+# Separators allowed between the words of a phrase: whitespace and hyphens/dashes
+PHRASE_SEPARATOR = r"[\s\-‐-―]+"
+
+# Arrow's RE2 engine treats \s and \b as ASCII-only, unlike Python's re. RE2
+# patterns spell out Python's Unicode whitespace and word characters instead
+_RE2_SPACE = r"\s\x0b\x1c-\x1f\x85\p{Z}"
+_RE2_NOT_WORD = r"[^\p{L}\p{N}_]"
+
+_TOKEN = re.compile(r'\s*(?:(\()|(\))|"([^"]*)"|([^\s()"]+))')
+_OPERATORS = {"AND", "OR", "NOT"}
+
+
+def keyword_regex(keyword, mode, re2=False):
+    """
+    Build the regex source for one keyword.
+
+    - substring: the keyword anywhere, e.g. "3" inside "2023".
+    - word: the keyword as a whole word, e.g. "3" in "3 regions" only.
+    - phrase: like word, but the keyword's words may be separated by any
+      whitespace or hyphens, so "three way" also matches "three-way".
+
+    With `re2`, the source is for RE2 (Arrow) and matches the same texts as
+    the default source does with Python's re. Word boundaries then consume
+    the neighbouring character, so only use it to test for a match.
+    """
+    if mode not in MODES:
+        raise ValueError(
+            f"Unknown keyword match mode {mode!r}; expected one of {MODES}"
+        )
+    keyword = keyword.strip()
+    if mode == "substring":
+        return re.escape(keyword)
+    if mode == "phrase":
+        separator = PHRASE_SEPARATOR
+        if re2:
+            separator = separator.replace(r"\s", _RE2_SPACE)
+        words = [word for word in re.split(PHRASE_SEPARATOR, keyword) if word]
+        body = separator.join(re.escape(word) for word in words)
+    else:
+        body = re.escape(keyword)
+    # Only anchor sides that start/end with a word character ("\bc++\b" never matches)
+    start = end = ""
+    if re.match(r"\w", keyword):
+        start = rf"(?:^|{_RE2_NOT_WORD})" if re2 else r"\b"
+    if re.search(r"\w$", keyword):
+        end = rf"(?:{_RE2_NOT_WORD}|$)" if re2 else r"\b"
+    return f"{start}{body}{end}"
+
+
+def parse_expression(expression):
+    """
+    Parse a boolean keyword expression into a tree.
+
+    Terms are bare words or "quoted phrases", combined with AND, OR, NOT and
+    parentheses (NOT binds tightest, then AND, then OR), e.g.
+    `("three way" OR 3wd) AND NOT survey`.
+
+    Returns:
+    - tuple: ("term", text), ("not", node), ("and", [nodes]) or ("or", [nodes]).
+    """
+    tokens = []
+    position = 0
+    expression = expression.strip()
+    while position < len(expression):
+        match = _TOKEN.match(expression, position)
+        if not match:
+            raise ValueError(
+                f"Cannot parse keyword expression at: {expression[position:]!r}"
+            )
+        position = match.end()
+        opening, closing, quoted, word = match.groups()
+        if opening:
+            tokens.append(("(", None))
+        elif closing:
+            tokens.append((")", None))
+        elif quoted is not None:
+            tokens.append(("term", quoted))
+        elif word.upper() in _OPERATORS:
+            tokens.append((word.upper(), None))
+        else:
+            tokens.append(("term", word))
+
+    def peek():
+        return tokens[0][0] if tokens else None
+
+    def parse_or():
+        nodes = [parse_and()]
+        while peek() == "OR":
+            tokens.pop(0)
+            nodes.append(parse_and())
+        return nodes[0] if len(nodes) == 1 else ("or", nodes)
+
+    def parse_and():
+        nodes = [parse_not()]
+        while peek() == "AND":
+            tokens.pop(0)
+            nodes.append(parse_not())
+        return nodes[0] if len(nodes) == 1 else ("and", nodes)
+
+    def parse_not():
+        if peek() == "NOT":
+            tokens.pop(0)
+            return ("not", parse_not())
+        return parse_atom()
+
+    def parse_atom():
+        if not tokens:
+            raise ValueError(f"Keyword expression ends unexpectedly: {expression!r}")
+        kind, value = tokens.pop(0)
+        if kind == "term":
+            return ("term", value)
+        if kind == "(":
+            node = parse_or()
+            if peek() != ")":
+                raise ValueError(f"Missing ')' in keyword expression: {expression!r}")
+            tokens.pop(0)
+            return node
+        raise ValueError(f"Unexpected {kind!r} in keyword expression: {expression!r}")
+
+    tree = parse_or()
+    if tokens:
+        raise ValueError(
+            f"Unexpected {tokens[0][0]!r} in keyword expression: {expression!r}"
+        )
+    return tree
+
+
+def expression_terms(tree):
+    """Return the terms used in an expression tree, in order of appearance."""
+    kind, value = tree
+    if kind == "term":
+        return [value]
+    if kind == "not":
+        return expression_terms(value)
+    return [term for node in value for term in expression_terms(node)]
+
+
+def evaluate_expression(tree, term_value, all_of=all, any_of=any, negate=None):
+    """
+    Evaluate an expression tree.
+
+    `term_value(term)` supplies each term's truth value. The combinators default
+    to plain booleans; pass numpy's logical functions to evaluate whole masks.
+    """
+    negate = negate or (lambda value: not value)
+    kind, value = tree
+    if kind == "term":
+        return term_value(value)
+    if kind == "not":
+        return negate(evaluate_expression(value, term_value, all_of, any_of, negate))
+    values = [
+        evaluate_expression(node, term_value, all_of, any_of, negate) for node in value
+    ]
+    return all_of(values) if kind == "and" else any_of(values)
+
+
+class KeywordMatcher:
+    """
+    Precompiled keyword matcher shared by the search and filter stages.
+
+    Each field (e.g. title, abstract) has its own keywords, each compiled once.
+    A paper is accepted when any field contains one of its keywords or, if a
+    boolean `expression` is configured, when the expression holds over the
+    paper's fields.
+    """
+
+    def __init__(self, keywords, mode="word", expression=None):
+        """
+        Args:
+        - keywords (dict): Keyword lists per field, e.g. {"title": [...]}.
+        - mode (str): "substring", "word" or "phrase" (see `keyword_regex`).
+        - expression (str): Optional boolean expression (see `parse_expression`).
+        """
+        self.mode = mode
+        self.keywords = {
+            field.lower(): list(dict.fromkeys(kw.lower() for kw in kws if kw))
+            for field, kws in keywords.items()
+        }
+        self.expression = parse_expression(expression) if expression else None
+
+        # term -> (literal every match contains, pattern for lowercased text,
+        # case-insensitive pattern for texts whose length changes when lowered)
+        self._terms = {}
+        terms = [kw for kws in self.keywords.values() for kw in kws]
+        if self.expression:
+            terms += [term.lower() for term in expression_terms(self.expression)]
+        for term in terms:
+            if term not in self._terms:
+                source = keyword_regex(term, mode)
+                literal = term.strip()
+                if mode == "phrase":
+                    literal = re.split(PHRASE_SEPARATOR, literal)[0]
+                self._terms[term] = (
+                    literal,
+                    re.compile(source),
+                    re.compile(source, re.IGNORECASE),
+                )
+
+    @classmethod
+    def from_config(cls, config):
+        """Build the matcher from the `search.filter` section of the config."""
+        filter_config = config["search"]["filter"]
+        return cls(
+            filter_config["keywords"],
+            filter_config.get("mode", "word"),
+            filter_config.get("expression"),
+        )
+
+    def any_pattern(self, field, re2=False):
+        """
+        Regex source matching any of a field's keywords, or None if it has none.
+
+        Plain alternation, so it can be handed to vectorized engines such as
+        `str.contains` or, with `re2`, Arrow's RE2 (case-insensitively).
+        """
+        kws = sorted(self.keywords.get(field.lower(), []), key=len, reverse=True)
+        if not kws:
+            return None
+        return "|".join(keyword_regex(kw, self.mode, re2) for kw in kws)
+
+    def term_pattern(self, term, re2=False):
+        """Regex source for one expression term, for vectorized evaluation."""
+        return keyword_regex(term, self.mode, re2)
+
+    def _finditer(self, term, text, lowered):
+        literal, pattern, ignore_case = self._terms[term]
+        # A plain substring test skips the regex for the many absent keywords
+        if literal not in lowered:
+            return iter(())
+        if len(lowered) == len(text):
+            return pattern.finditer(lowered)
+        return ignore_case.finditer(text)
+
+    def find(self, field, text):
+        """
+        Find every keyword occurrence of a field in `text`.
+
+        Returns:
+        - list[tuple]: (keyword, start, end) in text order; overlapping matches
+          (e.g. "3wd" and "3" in substring mode) are all reported.
+        """
+        if not isinstance(text, str):
+            return []
+        lowered = text.lower()
+        positions = [
+            (kw, hit.start(), hit.end())
+            for kw in self.keywords.get(field.lower(), [])
+            for hit in self._finditer(kw, text, lowered)
+        ]
+        return sorted(positions, key=lambda position: position[1])
+
+    def match(self, record):
+        """
+        Match a paper record.
+
+        Args:
+        - record (dict): Field texts, e.g. a row with "Title" and "Abstract";
+          field names are compared case-insensitively.
+
+        Returns:
+        - dict: "matched" (bool), "keywords" (sorted list of matched keywords)
+          and "positions" ({field: [(keyword, start, end)]}).
+        """
+        texts = {str(field).lower(): text for field, text in record.items()}
+        positions = {
+            field: self.find(field, texts.get(field)) for field in self.keywords
+        }
+        keywords = sorted({kw for hits in positions.values() for kw, _, _ in hits})
+
+        if self.expression:
+            searchable = [
+                (texts[field], texts[field].lower())
+                for field in self.keywords
+                if isinstance(texts.get(field), str)
+            ]
+            matched = evaluate_expression(
+                self.expression,
+                lambda term: any(
+                    next(self._finditer(term.lower(), text, lowered), None)
+                    for text, lowered in searchable
+                ),
+            )
+        else:
+            matched = bool(keywords)
+        return {"matched": matched, "keywords": keywords, "positions": positions}
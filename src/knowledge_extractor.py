@@ -1,15 +1,71 @@
+import asyncio
 import json
 import os
+import queue
+import threading
 import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 
 import openai
 import pandas as pd
 import PyPDF2
 
-from src.prompts.llm_prompt import get_prompt
+from src.chunking import chunk_text, merge_into_schema
+from src.prompts.llm_prompt import RESPONSE_SCHEMA, SYSTEM_PROMPT, get_messages
+from src.rate_limiter import (
+    RateLimiter,
+    backoff_seconds,
+    estimate_tokens,
+    retry_after_seconds,
+)
+from src.response_cache import ResponseCache, hash_text
+from src.storage import write_records
+from src.text_cache import TextCache
 from src.utils import load_env_var
 
+# Bump whenever `extract_text` changes so cached text is re-extracted
+EXTRACTOR_VERSION = f"pypdf2-{PyPDF2.__version__}-1"
+
+# Any edit to the prompt template changes this hash and invalidates cached responses
+PROMPT_HASH = hash_text(SYSTEM_PROMPT)
+
+
+def extract_text(pdf_path):
+    """
+    Extracts text from a PDF file.
+
+    Kept at module level so it can be shipped to `ProcessPoolExecutor` workers.
+
+    Args:
+    - pdf_path (Path): Path to the PDF file.
+
+    Returns:
+    - str: Extracted text.
+    """
+    try:
+        with open(pdf_path, "rb") as file:
+            reader = PyPDF2.PdfReader(file)
+            text = ""
+            for page in reader.pages:
+                text += page.extract_text()
+            return text
+    except Exception as e:
+        print(f"Error reading PDF {pdf_path}: {e}")
+        return ""
+
+
+def _kill_pool(pool):
+    """Terminate a process pool's workers, including ones stuck on a file."""
+    # ProcessPoolExecutor has no public way to stop a running task, so reach
+    # for its worker processes directly before shutting it down.
+    for process in list((pool._processes or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
 
 class KnowledgeExtractor:
     def __init__(self, config):
@@ -22,7 +78,32 @@ class KnowledgeExtractor:
         self.pdf_folder = Path(config["download"]["pdf_folder"])
         self.output_folder = Path(config["llm"]["output_folder"])
         self.merged_output_file = Path(config["llm"]["merged_responses_file"])
-        self.delay = config["llm"]["delay"]
+        self.model = config["llm"].get("model", "gpt-4o")
+        self.concurrency = config["llm"].get("concurrency", 4)
+        self.requests_per_minute = config["llm"].get("requests_per_minute")
+        self.tokens_per_minute = config["llm"].get("tokens_per_minute")
+        self.max_retries = config["llm"].get("max_retries", 6)
+        self.base_url = config["llm"].get("base_url")
+        self.max_chunk_tokens = config["llm"].get("max_chunk_tokens", 24000)
+        self.usage = {
+            "calls": 0,
+            "input_tokens": 0,
+            "cached_input_tokens": 0,
+            "output_tokens": 0,
+        }
+        self.batch_folder = Path(config["llm"].get("batch_folder", "./data/batches"))
+        self.batch_poll_interval = config["llm"].get("batch_poll_interval", 60)
+        self.extract_workers = config["llm"].get("extract_workers") or os.cpu_count()
+        self.extract_timeout = config["llm"].get("extract_timeout", 120)
+        self.queue_size = config["llm"].get("queue_size", 8)
+        self.text_cache = TextCache(
+            config["llm"].get("text_cache_folder", "./data/text_cache"),
+            config["llm"].get("text_cache_max_mb", 500) * 1024 * 1024,
+            EXTRACTOR_VERSION,
+        )
+        self.response_cache = ResponseCache(
+            config["llm"].get("response_cache_file", "./data/llm_cache.sqlite")
+        )
 
         # Load API key from the environment variable
         self.api_key = load_env_var("OPENAI_API_KEY")
@@ -30,6 +111,8 @@ class KnowledgeExtractor:
         if not self.api_key:
             raise ValueError("OPENAI_API_KEY is not set in the environment.")
         openai.api_key = self.api_key
+        if self.base_url:
+            openai.base_url = self.base_url
 
         # Ensure output folder exists
         self.output_folder.mkdir(parents=True, exist_ok=True)
@@ -48,16 +131,99 @@ class KnowledgeExtractor:
         Returns:
         - str: Extracted text.
         """
+        key = self.text_cache.key_for(pdf_path)
+        text = self.text_cache.get(key)
+        if text is None:
+            text = extract_text(pdf_path)
+            if text.strip():
+                self.text_cache.put(key, text)
+        return text
+
+    def _submit_extraction(self, pool, pdf_file):
+        """
+        Start extracting `pdf_file`, answering straight from the text cache if possible.
+
+        Returns:
+        - tuple: (cache key to store the result under, or None on a cache hit;
+          Future resolving to the extracted text).
+        """
+        key = self.text_cache.key_for(pdf_file)
+        text = self.text_cache.get(key)
+        if text is None:
+            return key, pool.submit(extract_text, pdf_file)
+        future = Future()
+        future.set_result(text)
+        return None, future
+
+    def _extract_stage(self, pdf_files, text_queue):
+        """
+        Parse PDFs on a process pool and feed `(pdf_path, text)` pairs to `text_queue`.
+
+        At most two files per worker are in flight so parsed text does not pile
+        up ahead of the LLM stage. A file that times out or crashes its worker
+        is reported with empty text and the pool is rebuilt for the rest.
+
+        Args:
+        - pdf_files (list[Path]): PDFs to parse, in processing order.
+        - text_queue (queue.Queue): Bounded queue consumed by the LLM stage;
+          `None` is put on it once every file has been handled.
+        """
+        pool = ProcessPoolExecutor(max_workers=self.extract_workers)
+        pending = deque()
+        remaining = iter(pdf_files)
         try:
-            with open(pdf_path, "rb") as file:
-                reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in reader.pages:
-                    text += page.extract_text()
-                return text
-        except Exception as e:
-            print(f"Error reading PDF {pdf_path}: {e}")
-            return ""
+            while True:
+                while len(pending) < self.extract_workers * 2:
+                    pdf_file = next(remaining, None)
+                    if pdf_file is None:
+                        break
+                    pending.append((pdf_file, *self._submit_extraction(pool, pdf_file)))
+                if not pending:
+                    break
+
+                pdf_file, key, future = pending.popleft()
+                try:
+                    text = future.result(timeout=self.extract_timeout)
+                except (FutureTimeoutError, BrokenProcessPool) as e:
+                    _kill_pool(pool)
+                    # A crash breaks every in-flight task, so re-run this file
+                    # on its own before blaming it
+                    if isinstance(e, BrokenProcessPool):
+                        text = self._extract_isolated(pdf_file)
+                    else:
+                        print(f"Error reading PDF {pdf_file}: extraction timed out")
+                        text = ""
+                    pool = ProcessPoolExecutor(max_workers=self.extract_workers)
+                    # Keep results that finished before the pool went down
+                    pending = deque(
+                        (path, path_key, done)
+                        if done.done()
+                        and not done.cancelled()
+                        and done.exception() is None
+                        else (path, path_key, pool.submit(extract_text, path))
+                        for path, path_key, done in pending
+                    )
+                if key and text.strip():
+                    self.text_cache.put(key, text)
+                text_queue.put((pdf_file, text))
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+            text_queue.put(None)
+
+    def _extract_isolated(self, pdf_file):
+        """Parse one PDF in a dedicated worker process, returning "" on failure."""
+        pool = ProcessPoolExecutor(max_workers=1)
+        try:
+            return pool.submit(extract_text, pdf_file).result(
+                timeout=self.extract_timeout
+            )
+        except FutureTimeoutError:
+            print(f"Error reading PDF {pdf_file}: extraction timed out")
+        except BrokenProcessPool:
+            print(f"Error reading PDF {pdf_file}: extraction crashed its worker")
+        finally:
+            _kill_pool(pool)
+        return ""
 
     def parse_json_output(self, json_string):
         """
@@ -84,35 +250,137 @@ class KnowledgeExtractor:
             print(f"Invalid JSON format: {e}")
             return None
 
-    def generate_structured_json(self, pdf_text):
+    def build_messages(self, pdf_text):
+        """Build the chat messages sent to the model for a paper's text."""
+        return get_messages(pdf_text)
+
+    def record_usage(self, name, usage):
+        """
+        Log and accumulate the token usage of one API call.
+
+        Cached input tokens are the part of the prompt prefix the provider
+        served from its prompt cache.
+
+        Args:
+        - name (str): Label for the log line.
+        - usage (CompletionUsage | dict): `usage` from a chat completion.
+        """
+        if not usage:
+            return
+        if isinstance(usage, dict):
+            input_tokens = usage.get("prompt_tokens", 0)
+            output_tokens = usage.get("completion_tokens", 0)
+            details = usage.get("prompt_tokens_details") or {}
+            cached_tokens = details.get("cached_tokens", 0)
+        else:
+            input_tokens = usage.prompt_tokens
+            output_tokens = usage.completion_tokens
+            details = getattr(usage, "prompt_tokens_details", None)
+            cached_tokens = getattr(details, "cached_tokens", 0) or 0
+
+        self.usage["calls"] += 1
+        self.usage["input_tokens"] += input_tokens
+        self.usage["cached_input_tokens"] += cached_tokens
+        self.usage["output_tokens"] += output_tokens
+        print(
+            f"Tokens for {name}: {input_tokens} input "
+            f"({cached_tokens} cached, {input_tokens - cached_tokens} uncached), "
+            f"{output_tokens} output."
+        )
+
+    def print_usage(self):
+        """Print the token usage accumulated over this run."""
+        usage = self.usage
+        cached_share = (
+            usage["cached_input_tokens"] / usage["input_tokens"]
+            if usage["input_tokens"]
+            else 0
+        )
+        print(
+            f"API usage: {usage['calls']} calls, {usage['input_tokens']} input tokens "
+            f"({usage['cached_input_tokens']} cached, {cached_share:.0%}), "
+            f"{usage['output_tokens']} output tokens."
+        )
+
+    def generate_structured_json(self, pdf_text, name="paper"):
         """
         Sends the extracted PDF text to OpenAI API with the prompt and generates a structured JSON.
 
         Args:
         - pdf_text (str): The text extracted from the PDF.
+        - name (str): Label used when logging token usage.
 
         Returns:
         - dict: Parsed JSON output from the model.
         """
-        prompt = get_prompt(pdf_text)
-
-        # print(prompt)
         try:
             response = openai.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a professional research assistant.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
+                model=self.model,
+                messages=self.build_messages(pdf_text),
             )
+            self.record_usage(name, response.usage)
             return response.choices[0].message.content.strip()
         except Exception as e:
             print(f"Error with OpenAI API: {e}")
             return None
 
+    async def agenerate_structured_json(self, client, limiter, pdf_text, name="paper"):
+        """
+        Async variant of `generate_structured_json` that respects the rate limits.
+
+        Waits on the requests/tokens-per-minute budget before each attempt and
+        retries rate-limit (429), server (5xx) and connection errors, honoring
+        the server's retry-after hint or backing off exponentially.
+
+        Args:
+        - client (openai.AsyncOpenAI): Client with its own retries disabled.
+        - limiter (RateLimiter): Shared rate limiter.
+        - pdf_text (str): The text extracted from the PDF.
+        - name (str): Label used when logging token usage.
+
+        Returns:
+        - str: Raw model output, or None if every attempt failed.
+        """
+        messages = self.build_messages(pdf_text)
+        estimated = estimate_tokens(messages[0]["content"] + messages[1]["content"])
+
+        for attempt in range(self.max_retries + 1):
+            await limiter.acquire(estimated)
+            try:
+                response = await client.chat.completions.create(
+                    model=self.model, messages=messages
+                )
+                if response.usage:
+                    limiter.record_usage(estimated, response.usage.total_tokens)
+                self.record_usage(name, response.usage)
+                # Refusals and filtered completions come back without content
+                content = response.choices[0].message.content
+                return content.strip() if content else None
+            except (
+                openai.RateLimitError,
+                openai.InternalServerError,
+                openai.APIConnectionError,
+            ) as e:
+                if attempt == self.max_retries:
+                    print(f"Error with OpenAI API (giving up): {e}")
+                    return None
+                response = getattr(e, "response", None)
+                wait = retry_after_seconds(getattr(response, "headers", None))
+                if wait is None:
+                    wait = backoff_seconds(attempt)
+                if isinstance(e, openai.RateLimitError):
+                    limiter.pause(wait)
+                print(
+                    f"OpenAI API error ({e.__class__.__name__}), "
+                    f"retrying in {wait:.1f}s"
+                )
+                await asyncio.sleep(wait)
+                continue
+            except Exception as e:
+                print(f"Error with OpenAI API: {e}")
+                return None
+        return None
+
     def process_pdf(self, pdf_path):
         """
         Process a single PDF file: Extracts text, generates JSON response, and parses the JSON.
@@ -124,60 +392,421 @@ class KnowledgeExtractor:
         - dict: Parsed and validated JSON response.
         """
         print(f"Processing {pdf_path.name}...")
-        pdf_text = self.extract_text_from_pdf(pdf_path)
+        return self.process_text(pdf_path, self.extract_text_from_pdf(pdf_path))
+
+    def process_text(self, pdf_path, pdf_text):
+        """
+        Generate and parse the JSON response for text already extracted from a PDF.
+
+        Args:
+        - pdf_path (Path): Path to the PDF file the text came from.
+        - pdf_text (str): Text extracted from the PDF.
+
+        Returns:
+        - dict: Parsed and validated JSON response.
+        """
         if not pdf_text.strip():
             print(f"Skipping {pdf_path.name} (No text extracted).")
             return None
 
-        raw_json = self.generate_structured_json(pdf_text)
+        chunks = chunk_text(pdf_text, self.max_chunk_tokens)
+        saved = self._saved_response(pdf_path, pdf_text, chunks)
+        if saved:
+            return saved
+        partials = [self._respond(pdf_path.name, chunk) for chunk in chunks]
+        return self._merge_partials(pdf_path.name, partials)
+
+    async def aprocess_text(self, client, limiter, pdf_path, pdf_text):
+        """
+        Async variant of `process_text` used by the concurrent scheduler.
+
+        The chunks of a long paper are sent concurrently.
+
+        Returns:
+        - dict: Parsed and validated JSON response.
+        """
+        if not pdf_text.strip():
+            print(f"Skipping {pdf_path.name} (No text extracted).")
+            return None
+
+        chunks = chunk_text(pdf_text, self.max_chunk_tokens)
+        saved = self._saved_response(pdf_path, pdf_text, chunks)
+        if saved:
+            return saved
+        partials = await asyncio.gather(
+            *(self._arespond(client, limiter, pdf_path.name, chunk) for chunk in chunks)
+        )
+        return self._merge_partials(pdf_path.name, partials)
+
+    def _saved_response(self, pdf_path, pdf_text, chunks):
+        """
+        Return a response saved in the output folder before the cache existed.
+
+        Earlier runs skipped every PDF that already had a response file. A file
+        whose paper text the cache has never seen is such a response: it is
+        stored in the cache under the hash of the whole text and looked up here
+        on later runs, so it is reused until the model or the prompt changes
+        instead of being sent again.
+
+        Returns:
+        - dict: The saved response, or None if the paper goes through the API.
+        """
+        text_hash = hash_text(pdf_text)
+        chunk_hashes = [hash_text(chunk) for chunk in chunks]
+        output_file = self.output_folder / f"{pdf_path.stem}.json"
+        if output_file.exists() and not self.response_cache.has_text(
+            [text_hash, *chunk_hashes]
+        ):
+            with open(output_file, encoding="utf-8") as f:
+                raw_json = f.read()
+            parsed_json = self.parse_json_output(raw_json)
+            if parsed_json:
+                self.response_cache.put(self.model, PROMPT_HASH, text_hash, raw_json)
+                print(f"Seeded response cache from {output_file}.")
+                return parsed_json
+
+        # Chunks drop the bibliography, so `_respond` only finds the whole
+        # text's entry when it is also the single chunk's
+        if text_hash not in chunk_hashes:
+            raw_json = self.response_cache.peek(self.model, PROMPT_HASH, text_hash)
+            if raw_json:
+                print(f"Using cached response for {pdf_path.name}.")
+                return self.parse_json_output(raw_json)
+        return None
+
+    def _respond(self, name, chunk):
+        """Return the parsed response for one chunk, from the cache or the API."""
+        text_hash = hash_text(chunk)
+        raw_json = self.response_cache.get(self.model, PROMPT_HASH, text_hash)
+        cached = raw_json is not None
+        if cached:
+            print(f"Using cached response for {name}.")
+        else:
+            raw_json = self.generate_structured_json(chunk, name)
+        return self._finish_response(name, raw_json, text_hash, cached)
+
+    async def _arespond(self, client, limiter, name, chunk):
+        """Async variant of `_respond`."""
+        text_hash = hash_text(chunk)
+        raw_json = self.response_cache.get(self.model, PROMPT_HASH, text_hash)
+        cached = raw_json is not None
+        if cached:
+            print(f"Using cached response for {name}.")
+        else:
+            raw_json = await self.agenerate_structured_json(
+                client, limiter, chunk, name
+            )
+        return self._finish_response(name, raw_json, text_hash, cached)
+
+    def _finish_response(
+        self, name, raw_json, text_hash, cached, model=None, prompt_hash=None
+    ):
+        """
+        Parse a raw response and cache it if it was fresh and valid.
+
+        `model` and `prompt_hash` default to the current ones; batch results are
+        cached under those they were submitted with.
+        """
         if not raw_json:
-            print(f"Skipping {pdf_path.name} (No JSON generated).")
+            print(f"Skipping {name} (No JSON generated).")
             return None
 
         parsed_json = self.parse_json_output(raw_json)
         if not parsed_json:
-            print(f"Skipping {pdf_path.name} (Invalid JSON format).")
+            print(f"Skipping {name} (Invalid JSON format).")
             return None
 
+        # Only cache responses that parsed, so bad outputs are retried next run
+        if not cached:
+            self.response_cache.put(
+                model or self.model, prompt_hash or PROMPT_HASH, text_hash, raw_json
+            )
         return parsed_json
 
-    def process_all_pdfs(self):
-        """
-        Process all PDF files in the folder, validate JSON, and save the responses as structured JSON files.
-        """
-        all_responses = []
+    def _merge_partials(self, name, partials):
+        """Combine per-chunk responses into one response shaped like the schema."""
+        if len(partials) == 1:
+            return partials[0]
+        valid = [partial for partial in partials if partial]
+        if not valid:
+            return None
+        if len(valid) < len(partials):
+            print(f"Warning: {len(valid)}/{len(partials)} chunks of {name} parsed.")
+        return merge_into_schema(RESPONSE_SCHEMA, valid)
 
-        for pdf_file in self.pdf_folder.glob("*.pdf"):
-            paper_id = pdf_file.stem
-            output_file = self.output_folder / f"{paper_id}.json"
+    async def _llm_stage(self, text_queue):
+        """
+        Run `concurrency` workers that send extracted text to the API.
 
-            if output_file.exists():
-                print(f"Skipping {pdf_file.name} (Already processed).")
-                continue
+        Args:
+        - text_queue (queue.Queue): Queue filled by `_extract_stage`.
 
-            llm_data = self.process_pdf(pdf_file)
-            if llm_data:
-                all_responses.append({"paper_id": paper_id, **llm_data})
+        Returns:
+        - list[dict]: Responses for every successfully processed paper.
+        """
+        client = openai.AsyncOpenAI(
+            api_key=self.api_key, base_url=self.base_url, max_retries=0
+        )
+        limiter = RateLimiter(self.requests_per_minute, self.tokens_per_minute)
+        all_responses = []
 
+        async def worker():
+            while True:
+                item = await asyncio.to_thread(text_queue.get)
+                if item is None:
+                    # Put the sentinel back so the other workers stop too
+                    text_queue.put(None)
+                    return
+                pdf_file, pdf_text = item
+                print(f"Processing {pdf_file.name}...")
+                # One bad paper must not stop the other workers, which would
+                # leave the extract stage blocked on a full queue
                 try:
-                    with open(output_file, "w", encoding="utf-8") as f:
-                        json.dump(llm_data, f, indent=4)
-                    print(
-                        f"Saved structured JSON for {pdf_file.name} to {output_file}."
+                    llm_data = await self.aprocess_text(
+                        client, limiter, pdf_file, pdf_text
                     )
                 except Exception as e:
-                    print(f"Error saving JSON for {pdf_file.name}: {e}")
+                    print(f"Error processing {pdf_file.name}: {e}")
+                    continue
+                if llm_data:
+                    all_responses.append({"paper_id": pdf_file.stem, **llm_data})
+                    self._save_response(pdf_file.stem, llm_data)
 
-            # Add a delay between processing files
-            print(
-                f"Waiting for {self.delay} seconds before processing the next file..."
-            )
-            time.sleep(self.delay)
+        try:
+            await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        finally:
+            await client.close()
+        return sorted(all_responses, key=lambda response: response["paper_id"])
 
-        # Save the merged JSON file
+    def process_all_pdfs(self):
+        """
+        Process all PDF files in the folder, validate JSON, and save the responses as structured JSON files.
+        """
+        # Every PDF goes through the pipeline: unchanged papers are answered from
+        # the text and response caches without calling the API
+        pdf_files = sorted(self.pdf_folder.glob("*.pdf"))
+
+        # PDF parsing runs on a process pool in the background while the LLM
+        # workers wait on the API, connected by a bounded queue
+        text_queue = queue.Queue(maxsize=self.queue_size)
+        extractor = threading.Thread(
+            target=self._extract_stage, args=(pdf_files, text_queue), daemon=True
+        )
+        extractor.start()
+        all_responses = asyncio.run(self._llm_stage(text_queue))
+        extractor.join()
+        lifetime = self.response_cache.lifetime_stats()
+        print(
+            f"LLM response cache: {self.response_cache.hits} hits, "
+            f"{self.response_cache.misses} misses "
+            f"({lifetime['hits']} hits, {lifetime['misses']} misses over all runs)."
+        )
+        self.print_usage()
+
+        self._save_merged(all_responses)
+
+    def _save_response(self, paper_id, llm_data):
+        """Write one paper's structured JSON to the output folder."""
+        output_file = self.output_folder / f"{paper_id}.json"
         try:
-            with open(self.merged_output_file, "w", encoding="utf-8") as merged_file:
-                json.dump(all_responses, merged_file, indent=4)
+            with open(output_file, "w", encoding="utf-8") as f:
+                json.dump(llm_data, f, indent=4)
+            print(f"Saved structured JSON for {paper_id} to {output_file}.")
+        except Exception as e:
+            print(f"Error saving JSON for {paper_id}: {e}")
+
+    def _save_merged(self, all_responses):
+        """Write every response into the merged file (JSON, or Parquet by suffix)."""
+        try:
+            write_records(all_responses, self.merged_output_file)
             print(f"Merged all LLM responses into {self.merged_output_file}")
         except Exception as e:
             print(f"Error saving merged JSON file: {e}")
+
+    def _collect_texts(self, pdf_files):
+        """Extract text for `pdf_files` through the process pool, in order."""
+        text_queue = queue.Queue(maxsize=self.queue_size)
+        extractor = threading.Thread(
+            target=self._extract_stage, args=(pdf_files, text_queue), daemon=True
+        )
+        extractor.start()
+        texts = []
+        while (item := text_queue.get()) is not None:
+            texts.append(item)
+        extractor.join()
+        return texts
+
+    def _batch_client(self):
+        return openai.OpenAI(api_key=self.api_key, base_url=self.base_url)
+
+    def submit_batch(self):
+        """
+        Write every uncached paper's request to a JSONL file and submit it as a batch.
+
+        Each line's `custom_id` is the paper_id, which is how results are matched
+        back on ingest. The batch id and the text hash of every request are kept
+        in `<batch_folder>/<batch_id>.json` so polling can resume later.
+
+        Returns:
+        - str: The batch id, or None if every paper was already cached.
+        """
+        self.batch_folder.mkdir(parents=True, exist_ok=True)
+        requests_file = self.batch_folder / f"requests_{int(time.time())}.jsonl"
+        papers = {}
+        requests = {}
+
+        with open(requests_file, "w", encoding="utf-8") as f:
+            for pdf_file, pdf_text in self._collect_texts(
+                sorted(self.pdf_folder.glob("*.pdf"))
+            ):
+                if not pdf_text.strip():
+                    print(f"Skipping {pdf_file.name} (No text extracted).")
+                    continue
+                chunks = chunk_text(pdf_text, self.max_chunk_tokens)
+                if self._saved_response(pdf_file, pdf_text, chunks):
+                    print(f"Skipping {pdf_file.name} (Cached response).")
+                    continue
+                text_hashes = [hash_text(chunk) for chunk in chunks]
+                pending = [
+                    (index, chunk)
+                    for index, (chunk, text_hash) in enumerate(zip(chunks, text_hashes))
+                    if not self.response_cache.get(self.model, PROMPT_HASH, text_hash)
+                ]
+                if not pending:
+                    print(f"Skipping {pdf_file.name} (Cached response).")
+                    continue
+
+                paper_id = pdf_file.stem
+                papers[paper_id] = text_hashes
+                for index, chunk in pending:
+                    custom_id = f"{paper_id}#{index}"
+                    requests[custom_id] = text_hashes[index]
+                    request = {
+                        "custom_id": custom_id,
+                        "method": "POST",
+                        "url": "/v1/chat/completions",
+                        "body": {
+                            "model": self.model,
+                            "messages": self.build_messages(chunk),
+                        },
+                    }
+                    f.write(json.dumps(request) + "\n")
+
+        if not requests:
+            requests_file.unlink()
+            print("Nothing to submit: every paper has a cached response.")
+            return None
+
+        client = self._batch_client()
+        with open(requests_file, "rb") as f:
+            input_file = client.files.create(file=f, purpose="batch")
+        batch = client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        state = {
+            "batch_id": batch.id,
+            "requests_file": str(requests_file),
+            "model": self.model,
+            "prompt_hash": PROMPT_HASH,
+            "papers": papers,
+            "requests": requests,
+        }
+        with open(self.batch_folder / f"{batch.id}.json", "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=4)
+        print(
+            f"Submitted batch {batch.id} with {len(requests)} requests "
+            f"for {len(papers)} papers."
+        )
+        return batch.id
+
+    def poll_batch(self, batch_id):
+        """
+        Wait for a submitted batch to finish.
+
+        Returns:
+        - Batch: The final batch object.
+        """
+        client = self._batch_client()
+        while True:
+            batch = client.batches.retrieve(batch_id)
+            counts = batch.request_counts
+            progress = f" ({counts.completed}/{counts.total} done)" if counts else ""
+            print(f"Batch {batch_id}: {batch.status}{progress}")
+            if batch.status in ("completed", "failed", "expired", "cancelled"):
+                return batch
+            time.sleep(self.batch_poll_interval)
+
+    def ingest_batch(self, batch_id):
+        """
+        Match a finished batch's results back to papers and save them.
+
+        Valid responses go into the response cache and `llm_responses/`, then the
+        merged JSON file is rebuilt from the output folder.
+        """
+        with open(self.batch_folder / f"{batch_id}.json", encoding="utf-8") as f:
+            state = json.load(f)
+
+        client = self._batch_client()
+        batch = client.batches.retrieve(batch_id)
+        if not batch.output_file_id:
+            print(f"Batch {batch_id} has no output ({batch.status}).")
+            return
+
+        results = {}
+        for line in client.files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            result = json.loads(line)
+            response = result.get("response") or {}
+            if result.get("error") or response.get("status_code") != 200:
+                print(f"Skipping {result['custom_id']} (Batch request failed).")
+                continue
+            body = response["body"]
+            self.record_usage(result["custom_id"], body.get("usage"))
+            message = body["choices"][0]["message"]
+            results[result["custom_id"]] = message["content"].strip()
+
+        # Rebuild each paper from its fresh chunk results plus any chunks that
+        # were already cached when the batch was submitted
+        ingested = 0
+        for paper_id, text_hashes in state["papers"].items():
+            partials = []
+            for index, text_hash in enumerate(text_hashes):
+                name = f"{paper_id} (chunk {index + 1}/{len(text_hashes)})"
+                raw_json = results.get(f"{paper_id}#{index}")
+                cached = raw_json is None
+                if cached:
+                    raw_json = self.response_cache.get(
+                        state["model"], state["prompt_hash"], text_hash
+                    )
+                partials.append(
+                    self._finish_response(
+                        name,
+                        raw_json,
+                        text_hash,
+                        cached,
+                        state["model"],
+                        state["prompt_hash"],
+                    )
+                )
+            llm_data = self._merge_partials(paper_id, partials)
+            if llm_data:
+                self._save_response(paper_id, llm_data)
+                ingested += 1
+
+        print(f"Ingested {ingested} responses from batch {batch_id}.")
+        self.print_usage()
+        all_responses = []
+        for output_file in sorted(self.output_folder.glob("*.json")):
+            with open(output_file, encoding="utf-8") as f:
+                all_responses.append({"paper_id": output_file.stem, **json.load(f)})
+        self._save_merged(all_responses)
+
+    def run_batch(self):
+        """Submit a batch, wait for it to finish and ingest the results."""
+        batch_id = self.submit_batch()
+        if batch_id:
+            self.poll_batch(batch_id)
+            self.ingest_batch(batch_id)
@@ -0,0 +1,91 @@
+import os
+import sqlite3
+import threading
+import time
+
+
+class DownloadManifest:
+    """Persistent record of every PDF download attempt, keyed by paper_id."""
+
+    COLUMNS = (
+        "paper_id",
+        "url",
+        "file_path",
+        "size",
+        "sha256",
+        "etag",
+        "last_modified",
+        "status",
+        "updated_at",
+    )
+
+    def __init__(self, db_path):
+        """
+        Open (or create) the manifest database.
+
+        Args:
+        - db_path (str): Path to the SQLite file backing the manifest.
+        """
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Downloads run on a thread pool, so share one connection behind a lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS downloads (
+                    paper_id TEXT PRIMARY KEY,
+                    url TEXT,
+                    file_path TEXT,
+                    size INTEGER,
+                    sha256 TEXT,
+                    etag TEXT,
+                    last_modified TEXT,
+                    status TEXT,
+                    updated_at REAL
+                )
+                """
+            )
+
+    def get(self, paper_id):
+        """Return the manifest entry for `paper_id` as a dict, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM downloads WHERE paper_id = ?", (paper_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def update(self, paper_id, **fields):
+        """Insert or update the entry for `paper_id` with the given fields."""
+        unknown = set(fields) - set(self.COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown manifest fields: {', '.join(sorted(unknown))}")
+
+        entry = self.get(paper_id) or {column: None for column in self.COLUMNS}
+        entry.update(fields, paper_id=paper_id, updated_at=time.time())
+        placeholders = ", ".join("?" for _ in self.COLUMNS)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO downloads ({', '.join(self.COLUMNS)}) "
+                f"VALUES ({placeholders})",
+                [entry[column] for column in self.COLUMNS],
+            )
+
+    def is_complete(self, paper_id, file_path):
+        """Check whether `paper_id` finished downloading and its file is intact."""
+        entry = self.get(paper_id)
+        return bool(
+            entry
+            and entry["status"] == "completed"
+            and os.path.exists(file_path)
+            and os.path.getsize(file_path) == entry["size"]
+        )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,196 @@
+import json
+import math
+import os
+import time
+from collections import Counter
+from pathlib import Path
+
+from src.normalization import MAPPED_FIELDS, NESTED_FIELDS, lookup_key
+
+
+def collect_unique_values(response_folder):
+    """
+    Count the values of every mapped field across the per-paper LLM responses.
+
+    Args:
+    - response_folder (str): Folder of `<paper_id>.json` responses.
+
+    Returns:
+    - dict: {field: Counter of value -> number of papers using it}
+    """
+    values = {field: Counter() for field in MAPPED_FIELDS}
+    for fields in NESTED_FIELDS.values():
+        values.update({field: Counter() for field in fields})
+
+    for response_file in sorted(Path(response_folder).glob("*.json")):
+        try:
+            with open(response_file, encoding="utf-8") as f:
+                paper = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Skipping {response_file}: {e}")
+            continue
+        if not isinstance(paper, dict):
+            continue
+        containers = [(paper, MAPPED_FIELDS)]
+        for parent, fields in NESTED_FIELDS.items():
+            if isinstance(paper.get(parent), dict):
+                containers.append((paper[parent], fields))
+        for container, fields in containers:
+            for field in fields:
+                value = container.get(field)
+                items = value if isinstance(value, list) else [value]
+                values[field].update(
+                    {item.strip() for item in items if isinstance(item, str)} - {""}
+                )
+    return values
+
+
+def trigrams(key):
+    """Character trigrams of a lookup key, with its start and end marked."""
+    padded = f"^{key}$"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class _UnionFind:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, item):
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+
+def similar_pairs(keys, threshold):
+    """
+    Find pairs of keys whose trigram Jaccard similarity reaches `threshold`.
+
+    Uses prefix-filter blocking: with each key's trigrams ordered rarest
+    first, two keys can only reach `threshold` if they share a trigram within
+    the first `n - ceil(threshold * n) + 1` of them. Only those prefixes are
+    indexed, so common trigrams ("ion", "ing", ...) rarely create candidates,
+    and a candidate is only compared when the set sizes allow `threshold`.
+
+    Returns:
+    - list[tuple]: (i, j) index pairs with i < j.
+    """
+    grams = [trigrams(key) for key in keys]
+    frequency = Counter(gram for key_grams in grams for gram in key_grams)
+
+    index = {}
+    pairs = []
+    for i, key_grams in enumerate(grams):
+        size = len(key_grams)
+        ordered = sorted(key_grams, key=lambda gram: (frequency[gram], gram))
+        # The epsilon keeps e.g. 0.7 * 10 from rounding up to 8
+        prefix = ordered[: size - math.ceil(threshold * size - 1e-9) + 1]
+        candidates = set()
+        for gram in prefix:
+            candidates.update(index.get(gram, ()))
+        for j in candidates:
+            other_size = len(grams[j])
+            if other_size < threshold * size or size < threshold * other_size:
+                continue
+            overlap = len(key_grams & grams[j])
+            if overlap >= threshold * (size + other_size - overlap):
+                pairs.append((j, i))
+        for gram in prefix:
+            index.setdefault(gram, []).append(i)
+    return pairs
+
+
+def suggest_mappings(counts, threshold=0.7):
+    """
+    Cluster the values of one field and map each to its cluster's canonical
+    value.
+
+    Values with the same lookup key always share a cluster; keys are joined
+    by `similar_pairs`. The most frequent value of a cluster (the shortest on
+    ties) becomes its canonical name.
+
+    Args:
+    - counts (Counter): Value -> number of papers using it.
+    - threshold (float): Trigram Jaccard similarity for joining two keys.
+
+    Returns:
+    - dict: {lowercased value: lowercased canonical value}, only for values
+      that differ from their canonical value.
+    """
+    by_key = {}
+    for value in counts:
+        key = lookup_key(value)
+        if key:
+            by_key.setdefault(key, []).append(value)
+    keys = list(by_key)
+
+    clusters = _UnionFind(len(keys))
+    for i, j in similar_pairs(keys, threshold):
+        clusters.union(i, j)
+
+    members = {}
+    for i, key in enumerate(keys):
+        members.setdefault(clusters.find(i), []).extend(by_key[key])
+
+    mapping = {}
+    for values in members.values():
+        if len(values) < 2:
+            continue
+        canonical = min(values, key=lambda value: (-counts[value], len(value), value))
+        for value in sorted(values):
+            if value.lower() != canonical.lower():
+                mapping[value.lower()] = canonical.lower()
+    return mapping
+
+
+def write_mappings(mappings, output_file):
+    """Write mappings as Python dict literals in the format of fuzzy_mappings.py."""
+    directory = os.path.dirname(output_file)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    blocks = ["# Suggested mappings: review before copying into fuzzy_mappings.py\n"]
+    for name, mapping in mappings.items():
+        entries = [
+            f"  {json.dumps(source)}: {json.dumps(target)}"
+            for source, target in sorted(mapping.items())
+        ]
+        body = ",\n".join(entries) + "\n" if entries else ""
+        blocks.append(f"{name} = {{\n{body}}}\n")
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write("\n".join(blocks))
+
+
+def suggest_from_responses(config):
+    """
+    Propose mappings for every field from the responses in `llm.output_folder`
+    and write them to `analysis.suggested_mappings_file`.
+
+    Returns:
+    - dict: {field: proposed mapping}
+    """
+    analysis_config = config.get("analysis", {})
+    output_file = analysis_config.get(
+        "suggested_mappings_file", "./data/suggested_mappings.py"
+    )
+    threshold = analysis_config.get("suggest_threshold", 0.7)
+
+    start = time.monotonic()
+    values = collect_unique_values(config["llm"]["output_folder"])
+    mappings = {}
+    for field, counts in values.items():
+        mappings[field] = suggest_mappings(counts, threshold)
+        print(
+            f"{field}: {len(counts)} distinct values, "
+            f"{len(mappings[field])} mapped to a canonical value"
+        )
+    write_mappings(mappings, output_file)
+    print(
+        f"Suggested mappings saved to {output_file} "
+        f"in {time.monotonic() - start:.1f}s"
+    )
+    return mappings
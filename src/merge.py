@@ -0,0 +1,207 @@
+import hashlib
+
+from src.dedup import normalize_text
+from src.mapping_suggestions import trigrams
+from src.storage import read_records, write_records
+
+MATCH_METHODS = ("paper_id", "title", "fuzzy")
+
+
+def title_hash(title):
+    """
+    Hash of a title after casefolding and dropping punctuation, so that
+    "A Survey of IDS." and "a survey of ids" share a hash.
+
+    Returns:
+    - str: Hex digest, or None for a missing or empty title.
+    """
+    normalized = normalize_text(title)
+    if not normalized:
+        return None
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _response_titles(response):
+    """Titles a response may be known by: its own, and the PDF name it came from."""
+    titles = [response.get("title")]
+    paper_id = response.get("paper_id")
+    if isinstance(paper_id, str):
+        titles.append(paper_id.replace("_", " "))
+    return [title for title in titles if isinstance(title, str)]
+
+
+class ResponseMerger:
+    """
+    Join LLM responses onto search results.
+
+    Each search result is matched to a response in three passes:
+    - paper_id: the response was extracted from the PDF saved under the
+      search result's paper_id.
+    - title: the normalized titles hash the same.
+    - fuzzy: the closest remaining response title by character-trigram
+      Jaccard similarity, if it reaches `threshold`. Like the exact passes,
+      each response is matched to one search result at most, the most
+      similar pairs being assigned first.
+
+    Every search result is kept (a left join, as in the analysis notebook),
+    with `match_method` and `match_confidence` (1.0 for exact matches, the
+    similarity for fuzzy ones, None when unmatched).
+    """
+
+    def __init__(self, threshold=0.8):
+        self.threshold = threshold
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(config.get("analysis", {}).get("merge_threshold", 0.8))
+
+    def _fuzzy_index(self, responses, used):
+        """Inverted trigram index over the titles of responses not matched yet."""
+        grams, index = {}, {}
+        for position, response in enumerate(responses):
+            if position in used:
+                continue
+            for title in _response_titles(response):
+                key = normalize_text(title)
+                if not key:
+                    continue
+                title_grams = trigrams(key)
+                grams[(position, key)] = title_grams
+                for gram in title_grams:
+                    index.setdefault(gram, set()).add((position, key))
+        return grams, index
+
+    def _fuzzy_candidates(self, title, grams, index):
+        """
+        Responses whose title is at least `threshold` similar to `title`.
+
+        Returns:
+        - dict: Response position -> similarity of its closest title.
+        """
+        key = normalize_text(title)
+        if not key:
+            return {}
+        title_grams = trigrams(key)
+        candidates = set()
+        for gram in title_grams:
+            candidates.update(index.get(gram, ()))
+        similarities = {}
+        for candidate in candidates:
+            overlap = len(title_grams & grams[candidate])
+            similarity = overlap / (len(title_grams) + len(grams[candidate]) - overlap)
+            position = candidate[0]
+            if similarity >= max(self.threshold, similarities.get(position, 0.0)):
+                similarities[position] = similarity
+        return similarities
+
+    def match(self, search_results, responses):
+        """
+        Find the response for each search result.
+
+        Returns:
+        - list[tuple]: Per search result, (response position or None, method,
+          confidence).
+        """
+        by_paper_id, by_title = {}, {}
+        for position, response in enumerate(responses):
+            paper_id = response.get("paper_id")
+            if paper_id:
+                by_paper_id.setdefault(str(paper_id), position)
+            for title in _response_titles(response):
+                digest = title_hash(title)
+                if digest:
+                    by_title.setdefault(digest, position)
+
+        matches = []
+        for result in search_results:
+            paper_id = result.get("paper_id")
+            digest = title_hash(result.get("Title"))
+            if paper_id and str(paper_id) in by_paper_id:
+                matches.append((by_paper_id[str(paper_id)], "paper_id", 1.0))
+            elif digest in by_title:
+                matches.append((by_title[digest], "title", 1.0))
+            else:
+                matches.append((None, None, None))
+
+        used = {position for position, _, _ in matches if position is not None}
+        pending = [i for i, (position, _, _) in enumerate(matches) if position is None]
+        if pending and len(used) < len(responses):
+            grams, index = self._fuzzy_index(responses, used)
+            pairs = []
+            for i in pending:
+                candidates = self._fuzzy_candidates(
+                    search_results[i].get("Title"), grams, index
+                )
+                pairs.extend(
+                    (-similarity, i, position)
+                    for position, similarity in candidates.items()
+                )
+            # Best pairs first, so each response goes to its closest search result
+            for negative_similarity, i, position in sorted(pairs):
+                if matches[i][0] is None and position not in used:
+                    matches[i] = (position, "fuzzy", round(-negative_similarity, 3))
+                    used.add(position)
+        return matches
+
+    def merge(self, search_results, responses):
+        """
+        Merge responses into search results.
+
+        Search result fields win over response fields of the same name.
+
+        Returns:
+        - tuple: (merged records, responses that matched no search result).
+        """
+        matches = self.match(search_results, responses)
+        merged = []
+        for result, (position, method, confidence) in zip(search_results, matches):
+            record = dict(responses[position]) if position is not None else {}
+            record.update(result)
+            record.setdefault("title", result.get("Title"))
+            record["title_hash"] = title_hash(result.get("Title"))
+            record["match_method"] = method
+            record["match_confidence"] = confidence
+            merged.append(record)
+        used = {position for position, _, _ in matches}
+        unmatched = [
+            response
+            for position, response in enumerate(responses)
+            if position not in used
+        ]
+        return merged, unmatched
+
+
+def merge_results(config):
+    """
+    Merge `llm.merged_responses_file` into the search results and write the
+    result to `analysis.merged_results_file` (JSON, JSON Lines or Parquet by
+    suffix).
+
+    Returns:
+    - list[dict]: The merged records.
+    """
+    output_file = config.get("analysis", {}).get(
+        "merged_results_file", "./data/merged_results.json"
+    )
+    search_results = read_records(config["search"]["output"])
+    responses = read_records(config["llm"]["merged_responses_file"])
+
+    merged, unmatched = ResponseMerger.from_config(config).merge(
+        search_results, responses
+    )
+    write_records(merged, output_file)
+
+    counts = {method: 0 for method in MATCH_METHODS}
+    for record in merged:
+        if record["match_method"]:
+            counts[record["match_method"]] += 1
+    print(
+        f"Matched {sum(counts.values())} of {len(merged)} search results: "
+        + ", ".join(f"{count} by {method}" for method, count in counts.items())
+        + "."
+    )
+    if unmatched:
+        print("Titles in LLM responses that do not have matches in search results:")
+        print("\n".join(str(response.get("title")) for response in unmatched))
+    print(f"Merged results saved to {output_file}")
+    return merged
@@ -0,0 +1,148 @@
+import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+from src.dedup import Deduplicator
+from src.search import PaperSearch
+from src.status_index import StatusIndex
+from src.storage import BatchedWriter, ensure_columns, read_table
+
+
+def load_queries(config, queries_file=None):
+    """
+    Read the search terms to run.
+
+    Args:
+    - config (dict): Configuration; `search.queries` is used without a file.
+    - queries_file (str): Text file with one query per line ("#" starts a comment).
+
+    Returns:
+    - list[str]: Queries in order, without blanks or repeats.
+    """
+    if queries_file:
+        with open(queries_file, encoding="utf-8") as f:
+            lines = [line.split("#", 1)[0].strip() for line in f]
+    else:
+        lines = [query.strip() for query in config["search"].get("queries") or []]
+    return list(dict.fromkeys(line for line in lines if line))
+
+
+class MultiQuerySearch:
+    """
+    Run many search terms concurrently into one shared results file.
+
+    Each worker owns its own `PaperSearch` (and so its own browser or HTTP
+    session) and takes queries from a shared queue. A paper found by several
+    queries, including near-duplicate listings of it (see `Deduplicator`), is
+    only written and downloaded once; rows are tagged with the query that found
+    them first.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.search_results_file = config["search"]["output"]
+        self.max_results = config["search"]["max_results"]
+        self.workers = config["search"].get("workers", 2)
+        self.flush_rows = config["search"].get("flush_rows", 50)
+        self.flush_seconds = config["search"].get("flush_seconds", 10)
+        self.status = StatusIndex(
+            config["output"].get("status_file", "./data/status_index.json")
+        )
+        self.dedup = Deduplicator.from_config(config)
+
+    def _load_seen(self):
+        """Remember papers already in the results file so reruns only add new ones."""
+        if not os.path.exists(self.search_results_file):
+            return
+        existing = read_table(
+            self.search_results_file, columns=["Title", "Abstract", "URL"]
+        )
+        for record in existing.to_dict(orient="records"):
+            self.dedup.add(record)
+
+    def _claim(self, paper_data):
+        """Return True if no query has produced this paper (or a near-duplicate)."""
+        return self.dedup.add(paper_data)[1]
+
+    def _run_query(self, searcher, query, writer, resume):
+        new = duplicates = 0
+        progress = {"downloaded": 0}
+        results = searcher.iter_resumable(query, writer, progress, resume)
+        for paper_data in results:
+            if progress["downloaded"] >= self.max_results:
+                break
+            if not self._claim(paper_data):
+                duplicates += 1
+                continue
+            if searcher.download_if_matched(paper_data):
+                progress["downloaded"] += 1
+            paper_data["Query"] = query
+            writer.write(paper_data)
+            new += 1
+        results.close()
+        print(
+            f"[{query}] {new} new results, {duplicates} duplicates, "
+            f"{progress['downloaded']} PDFs downloaded"
+        )
+        return new
+
+    def _worker(self, queries, writer, resume):
+        searcher = PaperSearch(self.config)
+        total = 0
+        try:
+            while True:
+                try:
+                    query = queries.get_nowait()
+                except queue.Empty:
+                    return total
+                try:
+                    total += self._run_query(searcher, query, writer, resume)
+                except Exception as e:
+                    print(f"[{query}] Search failed: {e}")
+        finally:
+            searcher.backend.close()
+
+    def run(self, queries, resume=False):
+        """
+        Search every query and append the new results to the results file.
+
+        Args:
+        - queries (list[str]): Search terms.
+        - resume (bool): Continue each query from its last checkpointed page.
+
+        Returns:
+        - int: Number of new results written.
+        """
+        if not queries:
+            print("No search queries given.")
+            return 0
+        self._load_seen()
+        # Results files from single-query runs have no Query column yet
+        ensure_columns(self.search_results_file, ["Query"])
+
+        pending = queue.Queue()
+        for query in queries:
+            pending.put(query)
+        workers = max(1, min(self.workers, len(queries)))
+
+        writer = BatchedWriter(
+            self.search_results_file,
+            self.flush_rows,
+            self.flush_seconds,
+            on_flush=lambda rows: self.status.increment(
+                "search_results", len(rows), path=self.search_results_file
+            ),
+        )
+        print(f"\nRunning {len(queries)} queries with {workers} workers...")
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(self._worker, pending, writer, resume)
+                    for _ in range(workers)
+                ]
+                total = sum(future.result() for future in futures)
+        finally:
+            writer.close()
+
+        print(f"\nMulti-query search completed: {total} new results.")
+        return total
@@ -0,0 +1,345 @@
+import ast
+import hashlib
+import json
+import os
+import re
+
+from src.storage import read_records, write_records
+
+# Bump when the compiled form changes so stale caches are rebuilt
+COMPILER_VERSION = "1"
+
+# Top-level list fields of the merged corpus, each cleaned with the mapping of
+# the same name in fuzzy_mappings.py
+MAPPED_FIELDS = (
+    "keywords",
+    "methodologies",
+    "category_domain",
+    "authors",
+    "performance_metrics",
+    "ml_models_used",
+    "datasets",
+)
+
+# Fields nested under a top-level object, cleaned the same way
+NESTED_FIELDS = {
+    "intrusion_detection_systems": (
+        "detection_methods",
+        "attack_types",
+        "evaluation_environment",
+    ),
+}
+
+_NON_ALNUM = re.compile(r"[\W_]+")
+
+
+def lookup_key(text):
+    """
+    Casefold `text` and drop punctuation and spaces, so that e.g. "KDD'99",
+    "kdd 99" and "KDD-99" all share the key "kdd99".
+    """
+    return _NON_ALNUM.sub("", text.casefold())
+
+
+def edit_distance(a, b, limit=None):
+    """
+    Levenshtein distance between two strings.
+
+    Args:
+    - a (str), b (str): Strings to compare.
+    - limit (int): Stop early and return `limit + 1` once the distance is
+      known to exceed it.
+
+    Returns:
+    - int
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if limit is not None and len(a) - len(b) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char_a != char_b),
+                )
+            )
+        if limit is not None and min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree over edit distance.
+
+    Finding every term within distance `radius` of a query only visits the
+    children whose edge distance lies within `radius` of the query's distance
+    to their parent, instead of comparing against every term.
+    """
+
+    def __init__(self, terms=()):
+        # Nodes are [term, {edge distance: child node}]
+        self.root = None
+        for term in terms:
+            self.add(term)
+
+    def add(self, term):
+        if self.root is None:
+            self.root = [term, {}]
+            return
+        node = self.root
+        while True:
+            distance = edit_distance(term, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = [term, {}]
+                return
+            node = child
+
+    def search(self, term, radius):
+        """Return (distance, term) pairs within `radius` of `term`, closest first."""
+        if self.root is None:
+            return []
+        matches = []
+        pending = [self.root]
+        while pending:
+            node_term, children = pending.pop()
+            # Beyond radius + the largest edge no child can match either
+            limit = radius + max(children, default=0)
+            distance = edit_distance(term, node_term, limit)
+            if distance <= radius:
+                matches.append((distance, node_term))
+            for edge, child in children.items():
+                if distance - radius <= edge <= distance + radius:
+                    pending.append(child)
+        return sorted(matches)
+
+    def to_data(self):
+        """Return the tree as JSON-serializable nested lists."""
+
+        def encode(node):
+            return [node[0], [[edge, encode(child)] for edge, child in node[1].items()]]
+
+        return encode(self.root) if self.root is not None else None
+
+    @classmethod
+    def from_data(cls, data):
+        def decode(node):
+            return [node[0], {edge: decode(child) for edge, child in node[1]}]
+
+        tree = cls()
+        tree.root = decode(data) if data is not None else None
+        return tree
+
+
+def load_mappings(mappings_file):
+    """
+    Read the mapping dicts from a fuzzy_mappings.py-style file without
+    importing it.
+
+    Returns:
+    - dict: {mapping name: {source string: canonical string}}
+    """
+    with open(mappings_file, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=mappings_file)
+    mappings = {}
+    for statement in tree.body:
+        if (
+            isinstance(statement, ast.Assign)
+            and len(statement.targets) == 1
+            and isinstance(statement.targets[0], ast.Name)
+            and isinstance(statement.value, ast.Dict)
+        ):
+            mappings[statement.targets[0].id] = ast.literal_eval(statement.value)
+    return mappings
+
+
+def compile_mappings(mappings):
+    """
+    Compile mapping dicts into lookup tables keyed by `lookup_key`.
+
+    Canonical values are lowercased, as the analysis has always done. When
+    two source strings collapse to the same key, the first one wins.
+
+    Returns:
+    - dict: {mapping name: {"table": {key: value}, "tree": BK-tree data}}
+    """
+    compiled = {}
+    for name, mapping in mappings.items():
+        table = {}
+        for source, canonical in mapping.items():
+            key = lookup_key(source)
+            if key:
+                table.setdefault(key, canonical.lower())
+        compiled[name] = {"table": table, "tree": BKTree(table).to_data()}
+    return compiled
+
+
+class Normalizer:
+    """
+    Maps extracted values (keywords, datasets, attack types, ...) to their
+    canonical names.
+
+    Each value is looked up by its case- and punctuation-insensitive key in
+    the compiled mapping of its field; values with no exact key fall back to
+    the closest key in a BK-tree, within `max_ratio` edits per character.
+    Values that still have no match are kept as they are.
+    """
+
+    def __init__(self, compiled, max_ratio=0.1):
+        self.tables = {name: entry["table"] for name, entry in compiled.items()}
+        self.trees = {
+            name: BKTree.from_data(entry["tree"]) for name, entry in compiled.items()
+        }
+        self.max_ratio = max_ratio
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Build a normalizer from `analysis.mappings_file`, reusing the compiled
+        tables in `analysis.normalization_cache` while the file is unchanged.
+        """
+        analysis_config = config.get("analysis", {})
+        mappings_file = analysis_config.get("mappings_file", "./fuzzy_mappings.py")
+        cache_file = analysis_config.get(
+            "normalization_cache", "./data/normalization_cache.json"
+        )
+        with open(mappings_file, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        source_hash = f"{COMPILER_VERSION}:{digest}"
+
+        compiled = None
+        try:
+            with open(cache_file, encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("source_hash") == source_hash:
+                compiled = cached["mappings"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            pass
+
+        if compiled is None:
+            print(f"Compiling mappings from {mappings_file}...")
+            compiled = compile_mappings(load_mappings(mappings_file))
+            directory = os.path.dirname(cache_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_file = f"{cache_file}.tmp"
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump({"source_hash": source_hash, "mappings": compiled}, f)
+            os.replace(tmp_file, cache_file)
+
+        return cls(compiled, analysis_config.get("fuzzy_max_ratio", 0.1))
+
+    def resolve(self, name, value):
+        """
+        Return the canonical form of `value` under mapping `name`.
+
+        Returns:
+        - tuple: (canonical value, "exact" | "fuzzy" | None). Unmatched values
+          are returned unchanged with None.
+        """
+        table = self.tables.get(name)
+        if not table or not isinstance(value, str):
+            return value, None
+        key = lookup_key(value)
+        if key in table:
+            return table[key], "exact"
+        radius = int(len(key) * self.max_ratio)
+        if radius:
+            matches = self.trees[name].search(key, radius)
+            if matches:
+                return table[matches[0][1]], "fuzzy"
+        return value, None
+
+    def normalize_corpus(self, papers):
+        """
+        Normalize every mapped field of every paper, in place.
+
+        Each distinct value is resolved once: a first pass collects the unique
+        values per mapping, and a second rewrites the fields from the resolved
+        table, deduplicating lists while keeping their order.
+
+        Returns:
+        - dict: Counts of distinct values matched "exact", "fuzzy" or "unmatched".
+        """
+
+        # (container, field) pairs; each field uses the mapping of its name
+        def field_values(paper):
+            for field in MAPPED_FIELDS:
+                yield paper, field
+            for parent, fields in NESTED_FIELDS.items():
+                nested = paper.get(parent)
+                if isinstance(nested, dict):
+                    for field in fields:
+                        yield nested, field
+
+        def items(value):
+            values = value if isinstance(value, list) else [value]
+            return [item for item in values if isinstance(item, str) and item]
+
+        unique = {}
+        for paper in papers:
+            for container, field in field_values(paper):
+                unique.setdefault(field, set()).update(items(container.get(field)))
+
+        stats = {"exact": 0, "fuzzy": 0, "unmatched": 0}
+        resolved = {}
+        for name, values in unique.items():
+            resolved[name] = {}
+            for value in values:
+                canonical, method = self.resolve(name, value)
+                resolved[name][value] = canonical
+                stats[method or "unmatched"] += 1
+
+        for paper in papers:
+            for container, field in field_values(paper):
+                value = container.get(field)
+                if isinstance(value, list):
+                    # Non-string items (e.g. dicts) are passed through unchanged
+                    cleaned, seen = [], set()
+                    for item in value:
+                        if isinstance(item, str):
+                            item = resolved[field].get(item, item)
+                            if item in seen:
+                                continue
+                            seen.add(item)
+                        cleaned.append(item)
+                    container[field] = cleaned
+                elif isinstance(value, str) and value:
+                    container[field] = resolved[field][value]
+        return stats
+
+
+def normalize_file(config):
+    """
+    Normalize the merged corpus (`analysis.merged_results_file`) into
+    `analysis.cleaned_results_file`.
+
+    Returns:
+    - list[dict]: The normalized papers.
+    """
+    analysis_config = config.get("analysis", {})
+    input_file = analysis_config.get(
+        "merged_results_file", "./data/merged_results.json"
+    )
+    output_file = analysis_config.get(
+        "cleaned_results_file", "./data/cleaned_merged_results.json"
+    )
+    papers = read_records(input_file)
+
+    stats = Normalizer.from_config(config).normalize_corpus(papers)
+    write_records(papers, output_file)
+    print(
+        f"Normalized {len(papers)} papers: {stats['exact']} values mapped exactly, "
+        f"{stats['fuzzy']} fuzzily, {stats['unmatched']} left unchanged."
+    )
+    print(f"Cleaned data saved to {output_file}")
+    return papers
@@ -1,20 +1,255 @@
+import os
+import queue
+import threading
+import time
+
+from prettytable import PrettyTable
+
+from src.dedup import Deduplicator
 from src.download import PDFDownloader
 from src.filter import PaperFilter
-from src.search import PaperSearcher
+from src.search import PaperSearch
+from src.storage import BatchedWriter
+
+# Marks the end of a stage's output on its queue
+_DONE = object()
+
+
+class StageMetrics:
+    """Items processed by a stage and where its time went."""
+
+    def __init__(self, name):
+        self.name = name
+        self.items = 0
+        self.busy = 0.0  # Working on items
+        self.starved = 0.0  # Waiting for input from the previous stage
+        self.blocked = 0.0  # Waiting for room on the next stage's queue
+        self.started = None
+        self.finished = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self.started is None:
+                self.started = time.monotonic()
+
+    def finish(self):
+        with self._lock:
+            self.finished = time.monotonic()
+
+    def add(self, items=0, busy=0.0, starved=0.0, blocked=0.0):
+        with self._lock:
+            self.items += items
+            self.busy += busy
+            self.starved += starved
+            self.blocked += blocked
+
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.monotonic()) - self.started
 
 
 class PaperSearchPipeline:
+    """
+    Streaming search -> filter -> download pipeline.
+
+    The search stage pushes each result onto a bounded queue as soon as its
+    page is parsed, the filter stage passes matching papers to a second
+    bounded queue, and a pool of download workers drains that. Downloads start
+    while later pages are still being fetched, and a full queue makes the
+    stage before it wait (backpressure) instead of buffering without limit.
+    """
+
     def __init__(self, config):
-        self.searcher = PaperSearcher(config)
+        self.searcher = PaperSearch(config)
         self.filter = PaperFilter(config)
         self.downloader = PDFDownloader(config)
+        self.dedup = Deduplicator.from_config(config)
+        self.max_results = config["search"]["max_results"]
+        self.queue_size = config.get("pipeline", {}).get("queue_size", 100)
+        self.download_workers = max(1, self.downloader.max_workers)
+
+    def _put(self, target, item, metrics, stop=None):
+        """
+        Put `item` on a bounded queue, waiting while it is full (backpressure).
+
+        With `stop`, gives up once the pipeline is stopping, since the stage
+        downstream has then stopped consuming. Returns False if it gave up.
+        """
+        start = time.monotonic()
+        try:
+            while True:
+                try:
+                    target.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    if stop is not None and stop.is_set():
+                        return False
+        finally:
+            metrics.add(blocked=time.monotonic() - start)
+
+    def _get(self, source, metrics):
+        start = time.monotonic()
+        item = source.get()
+        metrics.add(starved=time.monotonic() - start)
+        return item
+
+    def _search_stage(self, search_term, results, metrics, stop):
+        metrics.start()
+        writer = BatchedWriter(
+            self.searcher.search_results_file,
+            self.searcher.flush_rows,
+            self.searcher.flush_seconds,
+            on_flush=lambda rows: self.searcher.status.increment(
+                "search_results", len(rows), path=self.searcher.search_results_file
+            ),
+        )
+        try:
+            pages = self.searcher.iter_pages(search_term)
+            while not stop.is_set():
+                start = time.monotonic()
+                try:
+                    page = next(pages, None)
+                except RuntimeError as e:
+                    print(f"Search stopped: {e}")
+                    break
+                finally:
+                    metrics.add(busy=time.monotonic() - start)
+                if page is None:
+                    break
+                for paper_data in page[2]:
+                    writer.write(paper_data)
+                    metrics.add(items=1)
+                    if not self._put(results, paper_data, metrics, stop):
+                        break
+        finally:
+            writer.close()
+            self.searcher.backend.close()
+            self._put(results, _DONE, metrics, stop)
+            metrics.finish()
+
+    def _filter_stage(self, results, downloads, metrics, stop):
+        metrics.start()
+        writer = BatchedWriter(
+            self.filter.filtered_results_file,
+            self.searcher.flush_rows,
+            self.searcher.flush_seconds,
+            on_flush=lambda rows: self.filter.status.increment(
+                "filtered_results", len(rows), path=self.filter.filtered_results_file
+            ),
+        )
+        matched = 0
+        try:
+            while not stop.is_set():
+                paper_data = self._get(results, metrics)
+                if paper_data is _DONE:
+                    break
+                start = time.monotonic()
+                # Only matching papers are deduplicated; duplicates are merged
+                # into the paper already queued, if any
+                keep = self.filter.matcher.match(paper_data)["matched"]
+                keep = keep and self.dedup.add(paper_data)[1]
+                metrics.add(items=1, busy=time.monotonic() - start)
+                if not keep:
+                    continue
+                writer.write(paper_data)
+                self._put(downloads, paper_data, metrics)
+                matched += 1
+                if matched >= self.max_results:
+                    print(f"Reached {self.max_results} matching papers. Stopping.")
+                    break
+        finally:
+            if self.dedup.duplicates:
+                print(f"Skipped {self.dedup.duplicates} duplicate results.")
+            # Stops the search stage too if this stage ends early or fails
+            stop.set()
+            writer.close()
+            for _ in range(self.download_workers):
+                self._put(downloads, _DONE, metrics)
+            metrics.finish()
+
+    def _download_stage(self, downloads, metrics, outcomes, outcomes_lock):
+        metrics.start()
+        try:
+            while (paper_data := self._get(downloads, metrics)) is not _DONE:
+                title = paper_data.get("Title", "N/A")
+                start = time.monotonic()
+                try:
+                    status = self.downloader.download_paper(paper_data)
+                    if status == "skipped":
+                        print(f"Already downloaded: {title}")
+                    else:
+                        print(f"Successfully downloaded: {title}")
+                except Exception as e:
+                    status = "failed"
+                    print(f"Failed to download {title}: {e}")
+                metrics.add(items=1, busy=time.monotonic() - start)
+                with outcomes_lock:
+                    outcomes[status] = outcomes.get(status, 0) + 1
+        finally:
+            metrics.finish()
 
     def run(self, search_term):
-        print("Searching for papers...")
-        papers = self.searcher.search_papers(search_term)
+        """
+        Search, filter and download `search_term`'s results concurrently.
+
+        Returns:
+        - dict: Download outcome counts ("downloaded", "skipped", "failed").
+        """
+        os.makedirs(self.downloader.pdf_folder, exist_ok=True)
+        results = queue.Queue(maxsize=self.queue_size)
+        downloads = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        search_metrics = StageMetrics("search")
+        filter_metrics = StageMetrics("filter")
+        download_metrics = StageMetrics("download")
+        outcomes, outcomes_lock = {}, threading.Lock()
+
+        threads = [
+            threading.Thread(
+                target=self._search_stage,
+                args=(search_term, results, search_metrics, stop),
+            ),
+            threading.Thread(
+                target=self._filter_stage,
+                args=(results, downloads, filter_metrics, stop),
+            ),
+        ]
+        threads += [
+            threading.Thread(
+                target=self._download_stage,
+                args=(downloads, download_metrics, outcomes, outcomes_lock),
+            )
+            for _ in range(self.download_workers)
+        ]
+        print(f"Running pipeline for '{search_term}'...")
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
 
-        print("Filtering papers...")
-        filtered_papers = self.filter.filter_papers(papers)
+        self.print_metrics([search_metrics, filter_metrics, download_metrics])
+        return outcomes
 
-        print("Downloading PDFs...")
-        self.downloader.download_pdfs(filtered_papers)
+    @staticmethod
+    def print_metrics(stages):
+        """Print items, throughput and busy/starved/blocked time per stage."""
+        table = PrettyTable(
+            ["Stage", "Items", "Items/s", "Busy (s)", "Starved (s)", "Blocked (s)"]
+        )
+        for stage in stages:
+            elapsed = stage.elapsed()
+            rate = stage.items / elapsed if elapsed else 0.0
+            table.add_row(
+                [
+                    stage.name,
+                    stage.items,
+                    f"{rate:.2f}",
+                    f"{stage.busy:.1f}",
+                    f"{stage.starved:.1f}",
+                    f"{stage.blocked:.1f}",
+                ]
+            )
+        print("\n--- Pipeline Metrics ---")
+        print(table)
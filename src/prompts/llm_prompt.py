@@ -1,14 +1,50 @@
-def get_prompt(content):
-    """
-    Returns the LLM prompt with the content dynamically inserted.
+# Empty response skeleton mirroring the JSON schema in the prompt below. Used to
+# merge the partial responses of long papers that are extracted chunk by chunk.
+RESPONSE_SCHEMA = {
+    "paper_id": None,
+    "title": None,
+    "authors": [],
+    "year": None,
+    "journal_conference": None,
+    "abstract": None,
+    "keywords": [],
+    "methodologies": [],
+    "applications": [],
+    "performance_metrics": [],
+    "ml_models_used": [],
+    "datasets": [],
+    "results_findings": [],
+    "two_way_approaches": [],
+    "three_way_approaches": [],
+    "four_way_approaches": [],
+    "intrusion_detection_systems": {
+        "ids_type": [],
+        "detection_methods": [],
+        "attack_types": [],
+        "evaluation_environment": None,
+    },
+    "algorithm_details": [],
+    "architecture_details": [],
+    "techniques_and_concepts": [],
+    "data_handling": [],
+    "comparative_analysis": [],
+    "real_world_applicability": [],
+    "future_directions": [],
+    "advantages": [],
+    "challenges": [],
+    "gaps_opportunities": [],
+    "relationships": [],
+    "category_domain": [],
+    "category_methodology": [],
+}
 
-    Args:
-        content (str): The content to be included in the prompt.
 
-    Returns:
-        str: The dynamically formatted prompt.
-    """
-    return f"""
+SYSTEM_MESSAGE = "You are a professional research assistant."
+
+# Static instructions, schema and example. Kept byte-for-byte identical across
+# calls and placed ahead of the paper text so provider-side prompt caching can
+# reuse it; the paper content is the only part that varies.
+PROMPT_PREFIX = """
     You are an expert research paper information extractor. Your task is to read a research paper and output a structured JSON representation of its key information. Follow these instructions carefully:
 
     1. **Strict Adherence**: Strictly adhere to the JSON schema provided below. Do not deviate from the structure.
@@ -28,7 +64,7 @@ def get_prompt(content):
 
     ### **JSON Schema with Field Descriptions**
     ```json
-    {{
+    {
     "paper_id": "A unique identifier for the paper (e.g., Paper_01).",
     "title": "The exact title of the paper as it appears in the document.",
     "authors": ["List of all authors as they appear in the paper, each as a separate string."],
@@ -38,40 +74,40 @@ def get_prompt(content):
     "keywords": ["List of keywords provided in the paper."],
     "methodologies": ["List of methodologies or approaches used in the paper."],
     "applications": [
-        {{
+        {
         "application_name": "Name of the application or use case (e.g., 'Anomaly Detection').",
         "domain": "The domain or area of application (e.g., 'Network IDS', 'Host-based IDS').",
         "weight": "A numerical value indicating the importance or significance of the application (if available)."
-        }}
+        }
     ],
     "performance_metrics": ["List of performance metrics used or discussed in the paper."],
     "ml_models_used": ["List of machine learning models used in the paper."],
     "datasets": ["List of datasets used in the paper, if mentioned."],
     "results_findings": ["A summary of the key results or findings of the paper."],
     "two_way_approaches": [
-        {{
+        {
         "context": "The context or scenario where the two-way approach is applied.",
         "decisions": ["List of the two-way decisions made."]
-        }}
+        }
     ],
     "three_way_approaches": [
-        {{
+        {
         "context": "The context or scenario where the three-way approach is applied.",
         "decisions": ["List of the three-way decisions made."]
-        }}
+        }
     ],
     "four_way_approaches": [
-        {{
+        {
         "context": "The context or scenario where the four-way approach is applied.",
         "decisions": ["List of the four-way decisions made."]
-        }}
+        }
     ],
-    "intrusion_detection_systems": {{
+    "intrusion_detection_systems": {
         "ids_type": ["Type(s) of IDS used or discussed (e.g., 'Network IDS', 'Host-based IDS', 'Hybrid IDS')."],
         "detection_methods": ["Detection methods used (e.g., 'Anomaly-based', 'Signature-based', 'Hybrid')."],
         "attack_types": ["List of attack types detected or discussed (e.g., 'DoS', 'DDoS', 'SQL Injection')."],
         "evaluation_environment": "Description of environments used to evaluate the IDS (e.g., 'Simulated Network', 'Real-world Deployment')."
-    }},
+    },
     "algorithm_details": ["List of algorithms introduced or discussed."],
     "architecture_details": ["List of architecture descriptions or components discussed."],
     "techniques_and_concepts": ["List of techniques and concepts introduced or used in the paper."],
@@ -83,15 +119,15 @@ def get_prompt(content):
     "challenges": ["List of challenges or limitations identified in the paper."],
     "gaps_opportunities": ["List of research gaps or opportunities highlighted in the paper."],
     "relationships": [
-        {{
+        {
         "methodology_name": "Name of the methodology (e.g., 'Three-way Decision Theory').",
         "application_name": "Name of the associated application (e.g., 'Anomaly Detection').",
         "weight": "A numerical value indicating the strength or relevance of the relationship (if available)."
-        }}
+        }
     ],
     "category_domain": ["The overarching domain(s) or category(ies) of the paper (e.g., 'Cybersecurity')."],
     "category_methodology": ["The primary methodological approach(es) or category(ies) (e.g., 'Decision-theoretic')."]
-    }}
+    }
     ```
 
     ---
@@ -100,7 +136,7 @@ def get_prompt(content):
     Here is an example of a properly filled JSON object with semantic n-way decision approaches:
 
     ```json
-    {{
+    {
     "paper_id": "Paper_01",
     "title": "Three-way Decision Theory in Intrusion Detection Systems",
     "authors": ["John Doe", "Jane Smith"],
@@ -110,35 +146,35 @@ def get_prompt(content):
     "keywords": ["Three-way Decisions", "Intrusion Detection", "Cybersecurity"],
     "methodologies": ["Three-way Decision Theory", "Probabilistic Rough Sets"],
     "applications": [
-        {{
+        {
         "application_name": "Anomaly Detection",
         "domain": "Network IDS",
         "weight": 5
-        }}
+        }
     ],
     "performance_metrics": ["Accuracy", "Precision", "Recall", "F1 Score"],
     "ml_models_used": ["SVM", "Random Forest"],
     "datasets": ["KDD Cup 1999"],
     "results_findings": ["The proposed method achieved significant reduction in false positives."],
     "two_way_approaches": [
-        {{
+        {
         "context": "Transaction-level decision-making in financial fraud detection.",
         "decisions": ["Likely user activity", "Likely intruder activity"]
-        }}
+        }
     ],
     "three_way_approaches": [
-        {{
+        {
         "context": "Hierarchical decision-making for intrusion detection.",
         "decisions": ["Transaction Level", "Account Level", "Network Level"]
-        }}
+        }
     ],
     "four_way_approaches": [],
-    "intrusion_detection_systems": {{
+    "intrusion_detection_systems": {
         "ids_type": ["Network IDS", "Host-based IDS"],
         "detection_methods": ["Anomaly-based"],
         "attack_types": ["DoS", "SQL Injection"],
         "evaluation_environment": "Simulated Network"
-    }},
+    },
     "algorithm_details": ["Sequentially Stackable Linux Security (SSLS)"],
     "architecture_details": ["Three-way decision architecture with sliding windows."],
     "techniques_and_concepts": ["Sequence analysis", "Sliding window generation"],
@@ -150,15 +186,15 @@ def get_prompt(content):
     "challenges": ["Computational overhead"],
     "gaps_opportunities": ["Hybrid methodology integration"],
     "relationships": [
-        {{
+        {
         "methodology_name": "Three-way Decision Theory",
         "application_name": "Anomaly Detection",
         "weight": 5
-        }}
+        }
     ],
     "category_domain": ["Cybersecurity"],
     "category_methodology": ["Decision-theoretic"]
-    }}
+    }
     ```
 
     ---
@@ -170,5 +206,39 @@ def get_prompt(content):
     4. Output only the JSON object, without any additional text or explanation.
     5. Try your best to populate the `two_way_approaches`, `three_way_approaches` and `four_way_approaches` fields as best as you can, look for indirect or semantic usage too.
 
-    {content}
     """
+
+# Complete system message, built once at import
+SYSTEM_PROMPT = f"{SYSTEM_MESSAGE}\n{PROMPT_PREFIX}"
+
+
+def get_messages(content):
+    """
+    Returns the chat messages for extracting a paper's content.
+
+    The static prefix travels in the system message and the paper content is
+    the whole user message.
+
+    Args:
+        content (str): The content to be included in the prompt.
+
+    Returns:
+        list[dict]: Chat messages for the completions API.
+    """
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": content},
+    ]
+
+
+def get_prompt(content):
+    """
+    Returns the LLM prompt with the content dynamically inserted.
+
+    Args:
+        content (str): The content to be included in the prompt.
+
+    Returns:
+        str: The dynamically formatted prompt.
+    """
+    return PROMPT_PREFIX + content
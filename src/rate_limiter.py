@@ -0,0 +1,115 @@
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+
+def estimate_tokens(text):
+    """Rough token count for rate limiting (about four characters per token)."""
+    return len(text) // 4 + 1
+
+
+def retry_after_seconds(headers):
+    """
+    Read the server's requested wait from `retry-after-ms` / `retry-after` headers.
+
+    Args:
+    - headers (Mapping): Response headers.
+
+    Returns:
+    - float: Seconds to wait, or None if the server did not say.
+    """
+    if not headers:
+        return None
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return float(retry_after)
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_seconds(attempt, base=1.0, cap=60.0):
+    """Exponential backoff with full jitter for the given (zero-based) attempt."""
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+class TokenBucket:
+    """Asyncio token bucket refilled continuously at `per_minute` units per minute."""
+
+    def __init__(self, per_minute):
+        self.capacity = per_minute
+        self.tokens = float(per_minute)
+        self.rate = per_minute / 60
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount=1):
+        """Wait until `amount` units are available, then take them."""
+        # A single request larger than the bucket could otherwise never run
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    def consume(self, amount):
+        """Take (or, if negative, return) units without waiting; may go into debt."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limits for LLM calls."""
+
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None):
+        """
+        Args:
+        - requests_per_minute (int): Request budget, or None for no limit.
+        - tokens_per_minute (int): Token budget, or None for no limit.
+        """
+        self.requests = None
+        self.tokens = None
+        if requests_per_minute:
+            self.requests = TokenBucket(requests_per_minute)
+        if tokens_per_minute:
+            self.tokens = TokenBucket(tokens_per_minute)
+        self._resume_at = 0.0
+
+    async def acquire(self, tokens):
+        """Wait for a request slot and `tokens` worth of token budget."""
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.requests:
+            await self.requests.acquire(1)
+        if self.tokens:
+            await self.tokens.acquire(tokens)
+
+    def record_usage(self, estimated, actual):
+        """Correct the token budget once the real usage of a request is known."""
+        if self.tokens and actual is not None:
+            self.tokens.consume(actual - estimated)
+
+    def pause(self, seconds):
+        """Hold back every caller for `seconds`, e.g. after a 429 response."""
+        self._resume_at = max(self._resume_at, time.monotonic() + seconds)
@@ -0,0 +1,367 @@
+import hashlib
+import html
+import json
+import os
+
+from prettytable import PrettyTable
+
+from src.merge import title_hash
+from src.storage import read_records
+
+try:
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+except ImportError:  # Optional: only needed to render charts
+    plt = None
+
+# Bump when the aggregates change so old summaries are rebuilt
+SUMMARY_VERSION = 1
+
+# List fields counted as they are
+LIST_FIELDS = ("keywords", "methodologies", "authors", "ml_models_used", "datasets")
+
+AGGREGATES = LIST_FIELDS + ("years", "attack_types", "applications", "domains")
+
+# Aggregates in the top-3 table, with their labels
+TOP_CATEGORIES = (
+    ("Keywords", "keywords"),
+    ("Methodologies", "methodologies"),
+    ("Authors", "authors"),
+    ("ML Models", "ml_models_used"),
+    ("Datasets", "datasets"),
+    ("Attack Types", "attack_types"),
+)
+
+BAR_COLOR = "#595959ff"
+
+
+def _strings(values):
+    if not isinstance(values, list):
+        return []
+    return [value for value in values if isinstance(value, str) and value]
+
+
+def paper_entry(paper):
+    """
+    What one paper contributes to the aggregates.
+
+    Returns:
+    - dict: {"items": {aggregate: [values]}, "title": str, "citations": int}
+    """
+    items = {field: _strings(paper.get(field)) for field in LIST_FIELDS}
+    try:
+        items["years"] = [str(int(paper.get("year")))]
+    except (ValueError, TypeError):
+        items["years"] = []
+
+    ids = paper.get("intrusion_detection_systems")
+    if not isinstance(ids, dict):
+        ids = {}
+    items["attack_types"] = _strings(ids.get("attack_types"))
+
+    applications = [
+        app for app in paper.get("applications") or [] if isinstance(app, dict)
+    ]
+    items["applications"] = _strings(
+        [app.get("application_name") for app in applications]
+    )
+    items["domains"] = _strings([app.get("domain") for app in applications])
+
+    try:
+        citations = int(paper.get("Citations"))
+    except (ValueError, TypeError):
+        citations = None
+    return {
+        "items": items,
+        "title": paper.get("title") or paper.get("Title"),
+        "citations": citations,
+    }
+
+
+def source_state(path):
+    """
+    Size, timestamps and inodes of a corpus file, or of the part files of a
+    Parquet dataset, used to tell whether it changed since the last update.
+
+    The change time cannot be set back like the modification time, and a
+    file replaced by an atomic write gets a new inode.
+
+    Returns:
+    - list: [total bytes, latest mtime and latest ctime in nanoseconds,
+      sorted inode numbers]
+    """
+    paths = [path]
+    if os.path.isdir(path):
+        with os.scandir(path) as entries:
+            paths = [entry.path for entry in entries if entry.is_file()]
+    stats = [os.stat(file_path) for file_path in paths]
+    return [
+        sum(stat.st_size for stat in stats),
+        max((stat.st_mtime_ns for stat in stats), default=0),
+        max((stat.st_ctime_ns for stat in stats), default=0),
+        sorted(stat.st_ino for stat in stats),
+    ]
+
+
+class ReportSummary:
+    """
+    Aggregates of the analysis corpus, kept in a compact JSON summary.
+
+    Besides the counters, the summary keeps each paper's contribution under a
+    key derived from its title, with a hash of it, so `update` only has to
+    subtract and add the papers that were added, changed or removed. The
+    corpus is rewritten as a whole by --normalize, so a changed corpus is still
+    read and hashed in full; `source` records the state of the file it was
+    built from, so an unchanged corpus is not read at all.
+
+    That state comes from file metadata only: on filesystems without change
+    times or stable inodes, an edit that keeps the size and restores the
+    modification time goes unnoticed. `build_report(config, rebuild=True)`
+    (--report --rebuild) reads the corpus regardless.
+    """
+
+    def __init__(self, summary_file):
+        self.summary_file = summary_file
+        self.counts = {aggregate: {} for aggregate in AGGREGATES}
+        self.papers = {}
+        self.source = None
+        try:
+            with open(summary_file, encoding="utf-8") as f:
+                summary = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if summary.get("version") == SUMMARY_VERSION:
+            self.counts.update(summary["counts"])
+            self.papers = summary["papers"]
+            self.source = summary.get("source")
+
+    def _apply(self, entry, sign):
+        for aggregate, values in entry["items"].items():
+            counts = self.counts[aggregate]
+            for value in values:
+                counts[value] = counts.get(value, 0) + sign
+                if not counts[value]:
+                    del counts[value]
+
+    def update(self, papers):
+        """
+        Bring the aggregates in line with `papers`, the full corpus.
+
+        Returns:
+        - dict: Number of papers "added", "changed", "removed" and "unchanged".
+        """
+        stats = {"added": 0, "changed": 0, "removed": 0, "unchanged": 0}
+        occurrences = {}
+        seen = set()
+        for paper in papers:
+            base = paper.get("title_hash") or title_hash(
+                paper.get("title") or paper.get("Title")
+            )
+            base = base or "untitled"
+            # Repeated titles are counted separately, as the notebook did
+            occurrences[base] = occurrences.get(base, 0) + 1
+            key = base if occurrences[base] == 1 else f"{base}#{occurrences[base]}"
+            seen.add(key)
+
+            entry = paper_entry(paper)
+            entry["hash"] = hashlib.sha256(
+                json.dumps(entry, sort_keys=True).encode("utf-8")
+            ).hexdigest()
+            old = self.papers.get(key)
+            if old is not None and old["hash"] == entry["hash"]:
+                stats["unchanged"] += 1
+                continue
+            if old is not None:
+                self._apply(old, -1)
+                stats["changed"] += 1
+            else:
+                stats["added"] += 1
+            self._apply(entry, 1)
+            self.papers[key] = entry
+
+        for key in [key for key in self.papers if key not in seen]:
+            self._apply(self.papers.pop(key), -1)
+            stats["removed"] += 1
+        return stats
+
+    def save(self):
+        directory = os.path.dirname(self.summary_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_file = f"{self.summary_file}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": SUMMARY_VERSION,
+                    "source": self.source,
+                    "counts": self.counts,
+                    "papers": self.papers,
+                },
+                f,
+            )
+        os.replace(tmp_file, self.summary_file)
+
+    def top(self, aggregate, n):
+        """Return the `n` most common values of `aggregate` as (value, count)."""
+        counts = self.counts[aggregate]
+        return sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:n]
+
+    def top_cited(self, n):
+        """Return (title, citations) of the `n` most cited papers."""
+        cited = [
+            (entry["title"], entry["citations"])
+            for entry in self.papers.values()
+            if entry["citations"] is not None
+        ]
+        return sorted(cited, key=lambda paper: -paper[1])[:n]
+
+    def tables(self, n=3):
+        """Return the top categories and most cited papers as PrettyTables."""
+        categories = PrettyTable(["Category", f"Top {n} Items"])
+        for label, aggregate in TOP_CATEGORIES:
+            items = self.top(aggregate, n)
+            categories.add_row(
+                [label, "\n".join(f"{value} ({count})" for value, count in items)]
+            )
+        cited = PrettyTable(["Rank", "Title", "Citations"])
+        for rank, (title, citations) in enumerate(self.top_cited(n), 1):
+            cited.add_row([rank, title, citations])
+        return categories, cited
+
+
+def _bar_chart(items, title, path, color=BAR_COLOR, horizontal=False, ylabel=None):
+    labels = [str(label) for label, _ in items]
+    counts = [count for _, count in items]
+    fig, ax = plt.subplots(figsize=(12, 8) if horizontal else (10, 6))
+    if horizontal:
+        ax.barh(labels, counts, color=color, height=0.8)
+        ax.invert_yaxis()
+        ax.set_xlabel("Frequency")
+    else:
+        ax.bar(labels, counts, color=color)
+        ax.set_ylabel(ylabel or "Frequency")
+        ax.tick_params(axis="x", rotation=45)
+        plt.setp(ax.get_xticklabels(), ha="right")
+    ax.set_title(title)
+    fig.tight_layout()
+    fig.savefig(path, dpi=100)
+    plt.close(fig)
+
+
+def render_report(summary, report_folder, top_n=10):
+    """
+    Render the charts to PNG and an index.html that shows them with the tables.
+
+    Returns:
+    - str: Path of the HTML report.
+    """
+    if plt is None:
+        raise ImportError(
+            "matplotlib is required to render reports (pip install matplotlib)."
+        )
+    os.makedirs(report_folder, exist_ok=True)
+
+    years = sorted(summary.counts["years"].items(), key=lambda item: int(item[0]))
+    charts = [
+        (
+            "papers_per_year.png",
+            years,
+            "Number of Papers Published Each Year",
+            {"ylabel": f"Number of Papers (Total {len(summary.papers)})"},
+        ),
+        (
+            "top_methodologies.png",
+            summary.top("methodologies", top_n),
+            "Top Methodologies",
+            {},
+        ),
+        ("top_keywords.png", summary.top("keywords", top_n), "Top Keywords", {}),
+        (
+            "top_applications.png",
+            summary.top("applications", top_n),
+            f"Top {top_n} Applications in IDS Research",
+            {"color": "coral"},
+        ),
+        (
+            "top_domains.png",
+            summary.top("domains", top_n),
+            f"Top {top_n} Domains in IDS Research",
+            {"color": "orange"},
+        ),
+        (
+            "top_attack_types.png",
+            summary.top("attack_types", top_n),
+            f"Top {top_n} Attack Types by Frequency",
+            {"color": "teal", "horizontal": True},
+        ),
+    ]
+
+    sections = []
+    for file_name, items, title, options in charts:
+        if not items:
+            continue
+        _bar_chart(items, title, os.path.join(report_folder, file_name), **options)
+        sections.append(f'<h2>{html.escape(title)}</h2>\n<img src="{file_name}">')
+
+    categories, cited = summary.tables()
+    sections.append(f"<h2>Top Categories</h2>\n{categories.get_html_string()}")
+    sections.append(f"<h2>Top Cited Papers</h2>\n{cited.get_html_string()}")
+
+    report_file = os.path.join(report_folder, "index.html")
+    with open(report_file, "w", encoding="utf-8") as f:
+        f.write(
+            "<!DOCTYPE html>\n<html>\n<head><meta charset=\"utf-8\">"
+            "<title>Paper Analysis Report</title></head>\n<body>\n"
+            f"<h1>Paper Analysis Report ({len(summary.papers)} papers)</h1>\n"
+            + "\n".join(sections)
+            + "\n</body>\n</html>\n"
+        )
+    return report_file
+
+
+def build_report(config, rebuild=False):
+    """
+    Update the summary of `analysis.cleaned_results_file` and render the report.
+
+    Args:
+    - config (dict): Configuration dictionary from `config.yaml`.
+    - rebuild (bool): Read the corpus even if its file looks unchanged.
+
+    Returns:
+    - ReportSummary
+    """
+    analysis_config = config.get("analysis", {})
+    input_file = analysis_config.get(
+        "cleaned_results_file", "./data/cleaned_merged_results.json"
+    )
+    summary = ReportSummary(
+        analysis_config.get("report_summary_file", "./data/report_summary.json")
+    )
+    state = source_state(input_file)
+    if summary.source == state and not rebuild:
+        print(f"Report summary is up to date with {input_file}.")
+    else:
+        stats = summary.update(read_records(input_file))
+        summary.source = state
+        summary.save()
+        print(
+            f"Report summary: {stats['added']} papers added, "
+            f"{stats['changed']} changed, {stats['removed']} removed, "
+            f"{stats['unchanged']} unchanged."
+        )
+
+    categories, cited = summary.tables()
+    print("Top Categories Table:")
+    print(categories)
+    print("\nTop Cited Papers Table:")
+    print(cited)
+
+    report_file = render_report(
+        summary,
+        analysis_config.get("report_folder", "./data/report"),
+        analysis_config.get("report_top_n", 10),
+    )
+    print(f"Report saved to {report_file}")
+    return summary
@@ -0,0 +1,112 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+
+def hash_text(text):
+    """Return the SHA-256 hex digest of a string."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite cache of raw LLM responses keyed by (model, prompt hash, text hash)."""
+
+    def __init__(self, db_path):
+        """
+        Open (or create) the response cache.
+
+        Args:
+        - db_path (str): Path to the SQLite file backing the cache.
+        """
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    model TEXT,
+                    prompt_hash TEXT,
+                    text_hash TEXT,
+                    response TEXT,
+                    created_at REAL,
+                    PRIMARY KEY (model, prompt_hash, text_hash)
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS stats "
+                "(name TEXT PRIMARY KEY, value INTEGER)"
+            )
+
+    def _count(self, name):
+        self._conn.execute(
+            "INSERT INTO stats (name, value) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,),
+        )
+
+    def get(self, model, prompt_hash, text_hash):
+        """Return the cached response, or None on a miss. Updates hit/miss counters."""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT response FROM responses "
+                "WHERE model = ? AND prompt_hash = ? AND text_hash = ?",
+                (model, prompt_hash, text_hash),
+            ).fetchone()
+            if row:
+                self.hits += 1
+                self._count("hits")
+                return row[0]
+            self.misses += 1
+            self._count("misses")
+            return None
+
+    def peek(self, model, prompt_hash, text_hash):
+        """Like `get`, but without touching the hit/miss counters."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM responses "
+                "WHERE model = ? AND prompt_hash = ? AND text_hash = ?",
+                (model, prompt_hash, text_hash),
+            ).fetchone()
+        return row[0] if row else None
+
+    def has_text(self, text_hashes):
+        """Return True if any of `text_hashes` was cached, under any model or prompt."""
+        text_hashes = list(text_hashes)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM responses WHERE text_hash IN "
+                f"({', '.join('?' * len(text_hashes))}) LIMIT 1",
+                text_hashes,
+            ).fetchone()
+        return row is not None
+
+    def put(self, model, prompt_hash, text_hash, response):
+        """Store a raw response for the given key."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (model, prompt_hash, text_hash, response, time.time()),
+            )
+
+    def lifetime_stats(self):
+        """Return the hit/miss counters accumulated across all runs."""
+        with self._lock:
+            rows = self._conn.execute("SELECT name, value FROM stats").fetchall()
+        stats = {"hits": 0, "misses": 0}
+        stats.update(dict(rows))
+        return stats
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
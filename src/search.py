@@ -3,16 +3,15 @@ import re
 import time
 from collections import Counter, defaultdict
 
-import pandas as pd
 import requests
 from prettytable import PrettyTable
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from webdriver_manager.chrome import ChromeDriverManager
 
-from src.utils import save_to_csv
+from src.download import save_pdf_response
+from src.keyword_matcher import KeywordMatcher
+from src.search_backends import RESULTS_PER_PAGE, create_backend
+from src.search_checkpoint import SearchCheckpoint
+from src.status_index import StatusIndex
+from src.storage import BatchedWriter, read_table
 
 
 class PaperSearch:
@@ -20,19 +19,23 @@ class PaperSearch:
         self.config = config
         self.search_results_file = config["search"]["output"]
         self.pdf_folder = config["download"]["pdf_folder"]
-        self.keywords_title = config["search"]["filter"]["keywords"]["title"]
-        self.keywords_abstract = config["search"]["filter"]["keywords"]["abstract"]
+        self.matcher = KeywordMatcher.from_config(config)
         self.max_results = config["search"]["max_results"]
         self.delay = config["search"]["delay"]
+        self.flush_rows = config["search"].get("flush_rows", 50)
+        self.flush_seconds = config["search"].get("flush_seconds", 10)
+        self.max_pdf_bytes = config["download"].get("max_size_mb", 50) * 1024 * 1024
+        self.status = StatusIndex(
+            config["output"].get("status_file", "./data/status_index.json")
+        )
 
-        # Initialize Selenium WebDriver with options
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        self.driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()), options=chrome_options
+        self.checkpoint = SearchCheckpoint(
+            config["search"].get("checkpoint_file", "./data/search_checkpoint.json")
         )
 
+        # Result pages come from Selenium or plain HTTP, per `search.backend`
+        self.backend = create_backend(config)
+
         # Ensure the PDF folder exists
         os.makedirs(self.pdf_folder, exist_ok=True)
 
@@ -50,114 +53,174 @@ class PaperSearch:
             response = requests.get(url, stream=True, timeout=15)
             response.raise_for_status()
             file_path = os.path.join(self.pdf_folder, f"{paper_id}.pdf")
-            with open(file_path, "wb") as file:
-                file.write(response.content)
+            existed = os.path.exists(file_path)
+            size, _ = save_pdf_response(response, file_path, self.max_pdf_bytes)
+            if not existed:
+                self.status.increment(
+                    "papers", 1, size=size, path=self.pdf_folder, suffix=".pdf"
+                )
             return True
         except Exception as e:
             print(f"Failed to download PDF for {paper_id}: {e}")
             return False
 
-    def search_papers(self, search_term):
-        """Search, filter, and download papers in a single process."""
-        if os.path.exists(self.search_results_file):
+    def build_record(self, result):
+        """Turn a backend result into a search results row."""
+        title = result["title"]
+        match = self.matcher.match({"title": title, "abstract": result["abstract"]})
+        return {
+            "Title": title,
+            "Authors": result["authors"],
+            "Abstract": result["abstract"],
+            "Publication Year": result["year"],
+            "Venue": "Google Scholar",
+            "Citations": "N/A",
+            "URL": result["url"],
+            "paper_id": self.generate_paper_id(title),
+            "Keywords Matched": ", ".join(match["keywords"]),
+            "Download Failed": False,
+        }
+
+    def iter_pages(self, search_term, start=0):
+        """
+        Yield the results of `search_term` one page at a time.
+
+        Args:
+        - search_term (str): Query to run.
+        - start (int): Result offset to start from.
+
+        Yields:
+        - tuple: (page offset, offset of the next page, list of result rows).
+
+        Raises:
+        - RuntimeError: If a page cannot be fetched.
+        """
+        first_start = start
+        while True:
+            if start != first_start:
+                time.sleep(self.delay)
+            try:
+                results = self.backend.fetch_page(search_term, start)
+            except Exception as e:
+                raise RuntimeError(
+                    f"Failed to load results page at offset {start}: {e}"
+                ) from e
+            if not results:
+                print("No results found on this page. Exiting.")
+                return
+            # Blocks without a title link (e.g. [CITATION]) are not returned,
+            # so the page size, not the result count, gives the next offset
+            next_start = start + RESULTS_PER_PAGE
+            yield start, next_start, [self.build_record(result) for result in results]
+            start = next_start
+
+    def iter_results(self, search_term, start=0):
+        """Yield result rows for `search_term`, fetching pages as they are consumed."""
+        for _, _, records in self.iter_pages(search_term, start):
+            yield from records
+
+    def iter_resumable(self, search_term, writer, progress, resume=False):
+        """
+        Yield new result rows, checkpointing after every completed page.
+
+        Before each checkpoint the `writer` is flushed, so everything recorded
+        as seen is already on disk. With `resume`, the search continues from
+        the last checkpoint of `search_term` instead of the first page.
+
+        Args:
+        - search_term (str): Query to run.
+        - writer (BatchedWriter): Writer the caller saves the rows with.
+        - progress (dict): Counters the caller updates (e.g. "downloaded");
+          saved with each checkpoint and restored on resume.
+        - resume (bool): Continue from the saved checkpoint, if any.
+        """
+        start, seen = 0, set()
+        state = self.checkpoint.get(search_term) if resume else None
+        if state:
+            if state["completed"]:
+                print(f"Search for '{search_term}' already completed.")
+                return
+            start, seen = state["next_start"], set(state["seen"])
+            progress.update(state["progress"])
+            print(f"Resuming '{search_term}' from result {start}.")
+
+        for page_start, next_start, records in self.iter_pages(search_term, start):
+            try:
+                for paper_data in records:
+                    if paper_data["paper_id"] in seen:
+                        continue
+                    yield paper_data
+                    # Only counted as seen once the caller has handled it
+                    seen.add(paper_data["paper_id"])
+            except GeneratorExit:
+                # The caller stopped mid-page: resume by fetching this page again
+                writer.flush()
+                self.checkpoint.save(search_term, page_start, seen, progress)
+                raise
+            writer.flush()
+            self.checkpoint.save(search_term, next_start, seen, progress)
+            start = next_start
+        self.checkpoint.save(search_term, start, seen, progress, completed=True)
+
+    def download_if_matched(self, paper_data):
+        """
+        Download the paper's PDF if it matches the keywords.
+
+        Sets "Download Failed" on the row and returns True if a PDF was saved.
+        """
+        if not self.matcher.match(paper_data)["matched"]:
+            return False
+        success = self.download_pdf(paper_data["URL"], paper_data["paper_id"])
+        paper_data["Download Failed"] = not success
+        if success:
+            print(f"Downloaded: {paper_data['Title']}")
+        return success
+
+    def search_papers(self, search_term, resume=False):
+        """
+        Search, filter, and download papers in a single process.
+
+        With `resume`, an interrupted search continues from its last completed
+        page even though the results file already exists.
+        """
+        if os.path.exists(self.search_results_file) and not resume:
             print(
                 f"Search results file '{self.search_results_file}' already exists. Skipping search."
             )
             return
 
-        search_url = (
-            f"https://scholar.google.com/scholar?q={search_term.replace(' ', '+')}"
-        )
-        self.driver.get(search_url)
-        time.sleep(2)
-
         log_data = []
-        total_results = 0
+        progress = {"downloaded": 0}
 
-        print("\nSearching, filtering, and downloading papers...")
-        while total_results < self.max_results:
-            results = self.driver.find_elements(By.CSS_SELECTOR, "h3.gs_rt a")
-            if not results:
-                print("No results found on this page. Exiting.")
-                break
-
-            for result in results:
-                if total_results >= self.max_results:
+        # Buffer rows and append them in batches instead of once per result
+        writer = BatchedWriter(
+            self.search_results_file,
+            self.flush_rows,
+            self.flush_seconds,
+            on_flush=lambda rows: self.status.increment(
+                "search_results", len(rows), path=self.search_results_file
+            ),
+        )
+        try:
+            print("\nSearching, filtering, and downloading papers...")
+            results = self.iter_resumable(search_term, writer, progress, resume)
+            for paper_data in results:
+                if progress["downloaded"] >= self.max_results:
                     break
+                if self.download_if_matched(paper_data):
+                    progress["downloaded"] += 1
 
-                try:
-                    title = result.text
-                    url = result.get_attribute("href")
-                    parent = result.find_element(
-                        By.XPATH, "./ancestor::div[@class='gs_ri']"
-                    )
-                    authors_and_year = parent.find_element(
-                        By.CSS_SELECTOR, ".gs_a"
-                    ).text
-                    abstract = parent.find_element(By.CSS_SELECTOR, ".gs_rs").text
-
-                    # Extract authors and year
-                    authors = "N/A"
-                    year = "N/A"
-                    if authors_and_year:
-                        authors_split = authors_and_year.split("-")[0].strip()
-                        year_split = authors_and_year.split(",")[-1].strip()
-                        authors = authors_split if authors_split else "N/A"
-                        year = year_split if year_split.isdigit() else "N/A"
-
-                    # Generate a paper ID
-                    paper_id = self.generate_paper_id(title)
-
-                    # Check for keyword matches
-                    matches_title = [
-                        kw for kw in self.keywords_title if kw in title.lower()
-                    ]
-                    matches_abstract = [
-                        kw for kw in self.keywords_abstract if kw in abstract.lower()
-                    ]
-                    matched_keywords = set(matches_title + matches_abstract)
-
-                    # Prepare log entry
-                    paper_data = {
-                        "Title": title,
-                        "Authors": authors,
-                        "Abstract": abstract,
-                        "Publication Year": year,
-                        "Venue": "Google Scholar",
-                        "Citations": "N/A",
-                        "URL": url,
-                        "paper_id": paper_id,
-                        "Keywords Matched": ", ".join(matched_keywords),
-                        "Download Failed": False,
-                    }
-
-                    # Download the PDF if keywords matched
-                    if matched_keywords:
-                        success = self.download_pdf(url, paper_id)
-                        paper_data["Download Failed"] = not success
-                        if success:
-                            total_results += 1
-                            print(f"Downloaded: {title}")
-
-                    # Save the paper data to the CSV
-                    save_to_csv([paper_data], self.search_results_file)
-                    log_data.append(paper_data)
-
-                except Exception as e:
-                    print(f"Error processing result: {e}")
-
-            # Move to the next page
-            try:
-                next_button = self.driver.find_element(By.LINK_TEXT, "Next")
-                next_button.click()
-                time.sleep(self.delay)
-            except Exception:
-                print(
-                    "No more pages to load or 'Next' button unavailable. Ending search."
-                )
-                break
+                # Save the paper data to the CSV
+                writer.write(paper_data)
+                log_data.append(paper_data)
+            results.close()
+        except RuntimeError as e:
+            print(f"Search interrupted: {e}")
+            print("Run again with --resume to continue from the last completed page.")
+        finally:
+            writer.close()
+            self.backend.close()
 
-        self.driver.quit()
         print("\nSearch, filter, and download process completed.")
         return log_data
 
@@ -168,16 +231,25 @@ class PaperSearch:
             return
 
         # Load search results
-        search_results = pd.read_csv(self.search_results_file)
+        search_results = read_table(
+            self.search_results_file,
+            columns=["Title", "Abstract", "Keywords Matched"],
+        )
         combination_stats = defaultdict(lambda: {"Title": 0, "Abstract": 0, "Total": 0})
 
         for _, row in search_results.iterrows():
-            keywords = row["Keywords Matched"].split(", ")
+            keywords = row["Keywords Matched"]
+            keywords = keywords.split(", ") if isinstance(keywords, str) else []
+            match = self.matcher.match(
+                {"title": row["Title"], "abstract": row["Abstract"]}
+            )
+            title_hits = {kw for kw, _, _ in match["positions"].get("title", [])}
+            abstract_hits = {kw for kw, _, _ in match["positions"].get("abstract", [])}
             for keyword in keywords:
                 if keyword:
-                    if keyword in row["Title"].lower():
+                    if keyword in title_hits:
                         combination_stats[keyword]["Title"] += 1
-                    if keyword in row["Abstract"].lower():
+                    if keyword in abstract_hits:
                         combination_stats[keyword]["Abstract"] += 1
                     combination_stats[keyword]["Total"] += 1
 
@@ -0,0 +1,304 @@
+import re
+import time
+from abc import ABC, abstractmethod
+from urllib.parse import urlencode, urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from webdriver_manager.chrome import ChromeDriverManager
+
+try:
+    import lxml.html
+except ImportError:  # Optional: needed to parse whole result pages locally
+    lxml = None
+
+SCHOLAR_URL = "https://scholar.google.com/scholar"
+
+# Results Scholar lists per page; `start` offsets advance by this much
+RESULTS_PER_PAGE = 10
+
+# Scholar serves its regular result markup to ordinary desktop browsers
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+    ),
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+def search_url(query, start=0):
+    """Return the Scholar results URL for `query`, starting at result `start`."""
+    params = {"q": query}
+    if start:
+        params["start"] = start
+    return f"{SCHOLAR_URL}?{urlencode(params)}"
+
+
+def parse_authors_and_year(authors_and_year):
+    """
+    Split a result's byline ("A Author, B Author - Venue, 2021 - host").
+
+    Returns:
+    - tuple: (authors, year), each "N/A" when it cannot be read.
+    """
+    authors = "N/A"
+    year = "N/A"
+    if authors_and_year:
+        # Scholar separates the parts with non-breaking spaces ("\xa0- ")
+        parts = re.split(r"\s+-\s+", " ".join(authors_and_year.split()))
+        authors = parts[0].strip() or "N/A"
+        # The year closes the venue part; the last part is usually the host
+        years = re.findall(r"\b(?:19|20)\d{2}\b", " - ".join(parts[1:]))
+        year = years[-1] if years else "N/A"
+    return authors, year
+
+
+def parse_results_html(html):
+    """
+    Parse every result block (`div.gs_ri`) on a Scholar results page.
+
+    Args:
+    - html (str): Page source.
+
+    Returns:
+    - list[dict]: One dict per result with "title", "url", "authors", "year"
+      and "abstract". Results without a title link (e.g. citations) are skipped.
+    """
+    if lxml is None:
+        raise ImportError("lxml is required to parse result pages (pip install lxml).")
+    tree = lxml.html.fromstring(html)
+    results = []
+    for block in tree.xpath("//div[contains(concat(' ', @class, ' '), ' gs_ri ')]"):
+        links = block.xpath(".//h3[contains(@class, 'gs_rt')]//a")
+        if not links:
+            continue
+        byline = block.xpath(".//div[contains(@class, 'gs_a')]")
+        snippet = block.xpath(".//div[contains(@class, 'gs_rs')]")
+        authors, year = parse_authors_and_year(
+            byline[0].text_content().strip() if byline else ""
+        )
+        results.append(
+            {
+                "title": links[0].text_content().strip(),
+                "url": urljoin(SCHOLAR_URL, links[0].get("href", "")),
+                "authors": authors,
+                "year": year,
+                "abstract": snippet[0].text_content().strip() if snippet else "",
+            }
+        )
+    return results
+
+
+# Markup of the CAPTCHA pages only, so results that merely mention "unusual
+# traffic" or a "captcha" paper are not taken for one
+BLOCKED_PAGE = re.compile(
+    r"""id=["'](?:gs_captcha_ccl|captcha-form)["']"""
+    r"|Our systems have detected unusual traffic from your computer network"
+    r"""|action=["'][^"']*/sorry/"""
+)
+
+
+def is_blocked_page(html):
+    """Scholar answers automated traffic with a CAPTCHA page instead of results."""
+    return BLOCKED_PAGE.search(html) is not None
+
+
+class SearchBackend(ABC):
+    """
+    Source of Scholar result pages.
+
+    Backends return the results of one page at a time as dicts with "title",
+    "url", "authors", "year" and "abstract"; an empty list means no more results.
+    """
+
+    @abstractmethod
+    def fetch_page(self, query, start=0):
+        """
+        Return the results on the page starting at result offset `start`.
+
+        Raises:
+        - RuntimeError: If Scholar answers with a CAPTCHA page.
+        """
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+# Containers of the CAPTCHA pages, for modes that never fetch the page source
+BLOCKED_SELECTOR = "#gs_captcha_ccl, #captcha-form"
+
+# Reads every result block in the browser and returns them in one round-trip,
+# along with whether the page is a CAPTCHA
+EXTRACT_RESULTS_SCRIPT = """
+var rows = Array.from(document.querySelectorAll("div.gs_ri")).map(function (block) {
+    var link = block.querySelector("h3.gs_rt a");
+    var byline = block.querySelector(".gs_a");
+    var snippet = block.querySelector(".gs_rs");
+    return {
+        title: link ? link.textContent.trim() : null,
+        url: link ? link.href : null,
+        byline: byline ? byline.textContent.trim() : "",
+        abstract: snippet ? snippet.textContent.trim() : ""
+    };
+});
+return {blocked: document.querySelector(arguments[0]) !== null, rows: rows};
+"""
+
+EXTRACTION_MODES = ("page_source", "script", "elements")
+
+
+class SeleniumBackend(SearchBackend):
+    """
+    Headless Chrome backend. The browser is only started on first use.
+
+    `search.selenium_extraction` selects how results are read from a page:
+    - page_source: fetch the HTML once and parse it locally with lxml.
+    - script: collect every result with a single `execute_script` call.
+    - elements: several WebDriver calls per result (slowest; for debugging).
+    """
+
+    def __init__(self, config):
+        self.page_load_wait = config["search"].get("page_load_wait", 2)
+        self.extraction = config["search"].get("selenium_extraction", "page_source")
+        if self.extraction not in EXTRACTION_MODES:
+            raise ValueError(
+                f"Unknown selenium_extraction {self.extraction!r}; "
+                f"expected one of {EXTRACTION_MODES}"
+            )
+        self.driver = None
+
+    def _start_driver(self):
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+        return webdriver.Chrome(
+            service=Service(ChromeDriverManager().install()), options=chrome_options
+        )
+
+    def fetch_page(self, query, start=0):
+        if self.driver is None:
+            self.driver = self._start_driver()
+        load_start = time.perf_counter()
+        self.driver.get(search_url(query, start))
+        time.sleep(self.page_load_wait)
+        extract_start = time.perf_counter()
+
+        # A CAPTCHA page must fail the query rather than look like the end of
+        # the results
+        if self.extraction == "page_source":
+            page_source = self.driver.page_source
+            blocked = is_blocked_page(page_source)
+            results = [] if blocked else parse_results_html(page_source)
+        elif self.extraction == "script":
+            blocked, results = self._extract_with_script()
+        else:
+            blocked = bool(self.driver.find_elements(By.CSS_SELECTOR, BLOCKED_SELECTOR))
+            results = [] if blocked else self._extract_elements()
+        if blocked:
+            raise RuntimeError(
+                "Scholar answered with a CAPTCHA page; increase search.delay "
+                "and retry later."
+            )
+
+        extract_end = time.perf_counter()
+        print(
+            f"Page at offset {start}: {len(results)} results, "
+            f"load {extract_start - load_start:.2f}s, "
+            f"extract ({self.extraction}) {extract_end - extract_start:.3f}s"
+        )
+        return results
+
+    def _extract_with_script(self):
+        page = self.driver.execute_script(EXTRACT_RESULTS_SCRIPT, BLOCKED_SELECTOR)
+        results = []
+        for item in page["rows"]:
+            if not item["title"]:
+                continue
+            authors, year = parse_authors_and_year(item["byline"])
+            results.append(
+                {
+                    "title": item["title"],
+                    "url": item["url"],
+                    "authors": authors,
+                    "year": year,
+                    "abstract": item["abstract"],
+                }
+            )
+        return page["blocked"], results
+
+    def _extract_elements(self):
+        results = []
+        for result in self.driver.find_elements(By.CSS_SELECTOR, "h3.gs_rt a"):
+            try:
+                parent = result.find_element(
+                    By.XPATH, "./ancestor::div[contains(@class, 'gs_ri')]"
+                )
+                authors_and_year = parent.find_element(By.CSS_SELECTOR, ".gs_a").text
+                abstract = parent.find_element(By.CSS_SELECTOR, ".gs_rs").text
+            except Exception as e:
+                print(f"Error processing result: {e}")
+                continue
+            authors, year = parse_authors_and_year(authors_and_year)
+            results.append(
+                {
+                    "title": result.text,
+                    "url": result.get_attribute("href"),
+                    "authors": authors,
+                    "year": year,
+                    "abstract": abstract,
+                }
+            )
+        return results
+
+    def close(self):
+        if self.driver is not None:
+            self.driver.quit()
+            self.driver = None
+
+
+class HttpBackend(SearchBackend):
+    """Fetches result pages over a pooled HTTP session and parses them with lxml."""
+
+    def __init__(self, config):
+        self.timeout = config["search"].get("timeout", 30)
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=2)
+        self.session.mount("https://", adapter)
+
+    def fetch_page(self, query, start=0):
+        response = self.session.get(search_url(query, start), timeout=self.timeout)
+        if response.status_code == 429 or is_blocked_page(response.text):
+            raise RuntimeError(
+                "Scholar rejected the request as automated traffic; increase "
+                "search.delay or use the selenium backend."
+            )
+        response.raise_for_status()
+        return parse_results_html(response.text)
+
+    def close(self):
+        self.session.close()
+
+
+BACKENDS = {"selenium": SeleniumBackend, "http": HttpBackend}
+
+
+def create_backend(config):
+    """Create the backend named by `search.backend` (default: selenium)."""
+    name = config["search"].get("backend", "selenium")
+    if name not in BACKENDS:
+        raise ValueError(
+            f"Unknown search backend {name!r}; expected one of {sorted(BACKENDS)}"
+        )
+    return BACKENDS[name](config)
@@ -0,0 +1,72 @@
+import json
+import os
+import threading
+import time
+
+
+class SearchCheckpoint:
+    """
+    Per-query pagination checkpoints stored in a small JSON file.
+
+    After each completed results page the search records the offset of the
+    next page, the IDs it has already seen and its progress counters, so an
+    interrupted search can continue from there with Scholar's `start=`.
+    """
+
+    # Shared by all instances: concurrent searches each have their own
+    # checkpoint object but update the same file
+    _lock = threading.Lock()
+
+    def __init__(self, checkpoint_file):
+        self.checkpoint_file = checkpoint_file
+
+    def _load(self):
+        try:
+            with open(self.checkpoint_file, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def get(self, query):
+        """Return the saved state of `query`, or None if it was never checkpointed."""
+        with self._lock:
+            return self._load().get(query)
+
+    def save(self, query, next_start, seen, progress=None, completed=False):
+        """
+        Record the state of `query` after a page.
+
+        Args:
+        - query (str): Search term.
+        - next_start (int): Result offset to continue from.
+        - seen (iterable): paper_ids of the results already handled.
+        - progress (dict): Caller counters to restore on resume.
+        - completed (bool): True once the query has no more pages to fetch.
+        """
+        with self._lock:
+            checkpoints = self._load()
+            checkpoints[query] = {
+                "next_start": next_start,
+                "seen": sorted(seen),
+                "progress": progress or {},
+                "completed": completed,
+                "updated_at": time.time(),
+            }
+            directory = os.path.dirname(self.checkpoint_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_file = f"{self.checkpoint_file}.tmp"
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(checkpoints, f, indent=4)
+            os.replace(tmp_file, self.checkpoint_file)
+
+    def last_unfinished(self):
+        """Return the most recently checkpointed query that has not completed."""
+        with self._lock:
+            checkpoints = self._load()
+        unfinished = [
+            (state["updated_at"], query)
+            for query, state in checkpoints.items()
+            if not state["completed"]
+        ]
+        return max(unfinished)[1] if unfinished else None
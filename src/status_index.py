@@ -0,0 +1,139 @@
+import json
+import os
+import threading
+import time
+
+from src.storage import count_rows
+
+
+class StatusIndex:
+    """
+    Small JSON index of per-stage counts, sizes and modification times.
+
+    Each stage updates its entry as it writes, so showing the status only
+    needs this one file instead of parsing every results file.
+    """
+
+    # Shared by all instances: the search, filter and download stages each
+    # have their own index object but update the same file
+    _lock = threading.Lock()
+
+    def __init__(self, index_file):
+        self.index_file = index_file
+
+    def exists(self):
+        return os.path.exists(self.index_file)
+
+    def load(self):
+        """Return the index as `{stage: {"count", "bytes", "mtime", "path"}}`."""
+        try:
+            with open(self.index_file, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save(self, index):
+        directory = os.path.dirname(self.index_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_file = f"{self.index_file}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=4)
+        os.replace(tmp_file, self.index_file)
+
+    def increment(self, stage, count=1, size=None, path=None, suffix=None):
+        """
+        Add newly written records to a stage's entry.
+
+        Callers increment after writing, so a stage the index does not have yet
+        (e.g. its file predates the index) is seeded from `path`, which already
+        holds the new records, instead of starting from zero.
+
+        Args:
+        - stage (str): Stage name, e.g. "search_results".
+        - count (int): Number of records added.
+        - size (int): Bytes added. If omitted, the size is re-read from `path`.
+        - path (str): File, Parquet dataset or folder the stage writes to.
+        - suffix (str): For a folder of files, the suffix of the files it counts.
+        """
+        with self._lock:
+            index = self.load()
+            if stage not in index and path:
+                if suffix:
+                    index[stage] = _folder_entry(path, suffix)
+                else:
+                    index[stage] = _file_entry(path)
+                self._save(index)
+                return
+            entry = index.setdefault(stage, {"count": 0, "bytes": 0, "path": path})
+            entry["count"] += count
+            if size is not None:
+                entry["bytes"] += size
+                entry["mtime"] = time.time()
+            elif path:
+                entry["bytes"], entry["mtime"] = _path_stats(path)
+            if path:
+                entry["path"] = path
+            self._save(index)
+
+    def record(self, stage, path, count=None):
+        """
+        Set a stage's entry from its output file.
+
+        Args:
+        - stage (str): Stage name, e.g. "search_results".
+        - path (str): File or Parquet dataset the stage writes to.
+        - count (int): Known record count; counted from `path` if omitted.
+        """
+        entry = _file_entry(path, count)
+        with self._lock:
+            index = self.load()
+            index[stage] = entry
+            self._save(index)
+
+    def record_folder(self, stage, folder, suffix):
+        """Set a stage's entry by listing the files with `suffix` in `folder`."""
+        entry = _folder_entry(folder, suffix)
+        with self._lock:
+            index = self.load()
+            index[stage] = entry
+            self._save(index)
+
+
+def _file_entry(path, count=None):
+    """Index entry for a results file or Parquet dataset."""
+    size, mtime = _path_stats(path)
+    if count is None:
+        count = count_rows(path)
+    return {"count": count, "bytes": size, "mtime": mtime, "path": path}
+
+
+def _folder_entry(folder, suffix):
+    """Index entry for the files with `suffix` in `folder`."""
+    count, size, mtime = 0, 0, None
+    if os.path.isdir(folder):
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.endswith(suffix):
+                    stat = entry.stat()
+                    count += 1
+                    size += stat.st_size
+                    mtime = max(mtime or 0, stat.st_mtime)
+    return {"count": count, "bytes": size, "mtime": mtime, "path": folder}
+
+
+def _path_stats(path):
+    """Return (total bytes, latest mtime) for a file or a directory of files."""
+    if not os.path.exists(path):
+        return 0, None
+    if not os.path.isdir(path):
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime
+    size, mtime = 0, None
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_file():
+                stat = entry.stat()
+                size += stat.st_size
+                mtime = max(mtime or 0, stat.st_mtime)
+    return size, mtime
@@ -0,0 +1,382 @@
+import csv
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # Optional: only needed for `.parquet` paths
+    pa = None
+
+from src.utils import save_to_csv
+
+# Schema metadata key listing columns whose values were stored as JSON strings
+JSON_COLUMNS_KEY = b"json_columns"
+
+_FILTER_OPS = {
+    "==": lambda column, value: column == value,
+    "=": lambda column, value: column == value,
+    "!=": lambda column, value: column != value,
+    "<": lambda column, value: column < value,
+    "<=": lambda column, value: column <= value,
+    ">": lambda column, value: column > value,
+    ">=": lambda column, value: column >= value,
+    "in": lambda column, value: column.isin(value),
+    "not in": lambda column, value: ~column.isin(value),
+}
+
+
+def is_parquet(path):
+    """Parquet storage is selected by giving a path ending in `.parquet`."""
+    return str(path).endswith(".parquet")
+
+
+def is_jsonl(path):
+    """JSON Lines storage (one record per line) is selected by a `.jsonl` path."""
+    return str(path).endswith(".jsonl")
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError(
+            "pyarrow is required for .parquet storage paths (pip install pyarrow)."
+        )
+
+
+def _to_table(records, schema=None, json_columns=()):
+    """
+    Convert a list of dicts to an Arrow table.
+
+    Lists and dicts are stored as JSON strings and columns with mixed scalar
+    types as plain strings, so LLM outputs with inconsistent types still fit a
+    columnar schema. The JSON columns are recorded in the schema metadata.
+
+    Args:
+    - records (list[dict]): Rows to convert.
+    - schema (pyarrow.Schema): Schema of the dataset being appended to, if any.
+      Columns it already has keep their type where the values allow it.
+    - json_columns (set[str]): Columns the dataset already stores as JSON.
+    """
+    columns = []
+    for record in records:
+        for column in record:
+            if column not in columns:
+                columns.append(column)
+
+    arrays, table_json_columns = {}, []
+    for column in columns:
+        values = [record.get(column) for record in records]
+        present = [value for value in values if value is not None]
+        existing = None
+        if schema is not None and column in schema.names:
+            existing = schema.field(column).type
+        if column in json_columns or any(
+            isinstance(value, (list, dict)) for value in present
+        ):
+            table_json_columns.append(column)
+            values = [None if v is None else json.dumps(v) for v in values]
+            arrays[column] = pa.array(values, type=pa.string())
+        elif not present:
+            arrays[column] = pa.array(values, type=existing or pa.string())
+        elif len({type(value) for value in present}) > 1 or (
+            existing is not None and pa.types.is_string(existing)
+        ):
+            arrays[column] = pa.array(
+                [None if v is None else str(v) for v in values], type=pa.string()
+            )
+        else:
+            array = pa.array(values)
+            if existing is not None and array.type != existing:
+                try:
+                    array = array.cast(existing)
+                except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                    pass  # Conflicting parts are read back as strings
+            arrays[column] = array
+
+    table = pa.table(arrays)
+    return table.replace_schema_metadata(
+        {JSON_COLUMNS_KEY: json.dumps(table_json_columns).encode("utf-8")}
+    )
+
+
+def _unify_schemas(schemas):
+    """
+    Unify the schemas of a dataset's part files.
+
+    Numeric types are widened as needed; a column whose types cannot be
+    reconciled (e.g. int64 in one part and string in another) is read as
+    string.
+    """
+    try:
+        return pa.unify_schemas(schemas, promote_options="permissive")
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        pass
+    types = {}
+    for schema in schemas:
+        for field in schema:
+            types.setdefault(field.name, []).append(field.type)
+    fields = []
+    for name, field_types in types.items():
+        try:
+            unified = pa.unify_schemas(
+                [pa.schema([(name, field_type)]) for field_type in field_types],
+                promote_options="permissive",
+            )
+            fields.append(unified.field(name))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            fields.append(pa.field(name, pa.string()))
+    return pa.schema(fields)
+
+
+def _dataset_schema(path):
+    """
+    Read the unified schema and the JSON-encoded columns of a Parquet dataset
+    from its part files' footers only.
+
+    Returns:
+    - tuple: (pyarrow.Schema or None if there are no parts, set of column names).
+    """
+    fragments = list(ds.dataset(path, format="parquet").get_fragments())
+    schemas = [fragment.physical_schema for fragment in fragments]
+    json_columns = set()
+    for schema in schemas:
+        metadata = schema.metadata or {}
+        json_columns.update(json.loads(metadata.get(JSON_COLUMNS_KEY, b"[]")))
+    return (_unify_schemas(schemas) if schemas else None), json_columns
+
+
+def _open_dataset(path):
+    """
+    Open a Parquet dataset whose part files may have different columns.
+
+    Returns:
+    - tuple: (pyarrow.dataset.Dataset, set of JSON-encoded column names).
+    """
+    schema, json_columns = _dataset_schema(path)
+    return ds.dataset(path, format="parquet", schema=schema), json_columns
+
+
+def append_records(records, path):
+    """
+    Append records (a list of dicts) to a results file.
+
+    CSV paths are appended under their header, JSON Lines paths one line per
+    record. Parquet paths are datasets (directories) and each call adds one
+    immutable part file.
+    """
+    if not records:
+        return
+    if is_jsonl(path):
+        with open(path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, default=str) + "\n")
+        return
+    if not is_parquet(path):
+        save_to_csv(records, path)
+        return
+
+    _require_pyarrow()
+    os.makedirs(path, exist_ok=True)
+    # Cast to the columns already on disk so the parts keep a common schema
+    schema, json_columns = _dataset_schema(path)
+    part_name = f"part-{time.time_ns()}-{uuid.uuid4().hex[:8]}.parquet"
+    pq.write_table(
+        _to_table(records, schema, json_columns), os.path.join(path, part_name)
+    )
+
+
+def ensure_columns(path, columns):
+    """
+    Add missing columns to an existing CSV file, left empty on existing rows.
+
+    Appends only write the columns already in a CSV header, so a writer that
+    adds a column must extend the header first. Other formats take new columns
+    as they come.
+    """
+    if is_parquet(path) or is_jsonl(path) or str(path).endswith(".json"):
+        return
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
+    header = pd.read_csv(path, nrows=0).columns
+    missing = [column for column in columns if column not in header]
+    if not missing:
+        return
+    # Read as text so values are written back exactly as they were
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    for column in missing:
+        df[column] = ""
+    tmp_file = f"{path}.tmp"
+    df.to_csv(tmp_file, index=False)
+    os.replace(tmp_file, path)
+    print(f"Added columns to {path}: {', '.join(missing)}")
+
+
+def write_records(records, path):
+    """Write records to `path`, replacing any existing file or dataset."""
+    if is_parquet(path):
+        _require_pyarrow()
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        append_records(records, path)
+    elif is_jsonl(path):
+        if os.path.exists(path):
+            os.remove(path)
+        append_records(records, path)
+    elif str(path).endswith(".json"):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(records, f, indent=4)
+    else:
+        pd.DataFrame(records).to_csv(path, index=False)
+
+
+def _apply_filters(df, filters):
+    for column, op, value in filters:
+        df = df[_FILTER_OPS[op](df[column], value)]
+    return df
+
+
+def _decode_json(value):
+    """Decode a JSON column value; strings written before it held JSON stay as-is."""
+    if not isinstance(value, str):
+        return value
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        return value
+
+
+def read_table(path, columns=None, filters=None):
+    """
+    Read a results file into a DataFrame.
+
+    Args:
+    - path (str): CSV, JSON, JSON Lines or Parquet dataset path.
+    - columns (list[str]): Only load these columns (None = all).
+    - filters (list[tuple]): `(column, op, value)` predicates, ANDed together.
+      For Parquet they are pushed down so non-matching row groups are skipped.
+
+    Returns:
+    - pandas.DataFrame
+    """
+    filters = filters or []
+    if is_parquet(path):
+        _require_pyarrow()
+        dataset, json_columns = _open_dataset(path)
+        expression = pq.filters_to_expression(filters) if filters else None
+        df = dataset.to_table(columns=columns, filter=expression).to_pandas()
+        for column in json_columns & set(df.columns):
+            df[column] = df[column].map(_decode_json)
+        return df
+
+    if str(path).endswith(".json") or is_jsonl(path):
+        df = pd.read_json(path, orient="records", dtype=False, lines=is_jsonl(path))
+        if columns:
+            df = df[columns]
+        return _apply_filters(df, filters)
+
+    # CSV has no pushdown: load the projected and filtered columns only
+    needed = None
+    if columns:
+        needed = list(dict.fromkeys(list(columns) + [c for c, _, _ in filters]))
+    df = _apply_filters(pd.read_csv(path, usecols=needed), filters)
+    return df[columns] if columns else df
+
+
+def read_records(path):
+    """
+    Read a results file as a list of dicts, keeping nested lists and dicts.
+
+    Missing values are None rather than NaN, so records can be written back
+    to JSON unchanged.
+    """
+    if str(path).endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    if is_jsonl(path):
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    df = read_table(path)
+    return df.astype(object).where(df.notna(), None).to_dict(orient="records")
+
+
+def count_rows(path):
+    """
+    Count the records in a results file.
+
+    Parquet counts come from file metadata without reading any data; CSV files
+    are scanned with the csv module, which is much cheaper than pandas parsing.
+    """
+    if not os.path.exists(path):
+        return 0
+    if is_parquet(path):
+        _require_pyarrow()
+        return sum(
+            fragment.metadata.num_rows
+            for fragment in ds.dataset(path, format="parquet").get_fragments()
+        )
+    if str(path).endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            return len(json.load(f))
+    if is_jsonl(path):
+        with open(path, encoding="utf-8") as f:
+            return sum(1 for line in f if line.strip())
+    with open(path, newline="", encoding="utf-8") as f:
+        return max(0, sum(1 for _ in csv.reader(f)) - 1)
+
+
+class BatchedWriter:
+    """
+    Buffer rows in memory and append them to a results file in batches.
+
+    Rows are flushed once `flush_rows` are buffered or `flush_seconds` have
+    passed since the last flush, and on `close()`. Safe to share between threads.
+    `on_flush`, if given, is called with each batch after it has been written.
+    """
+
+    def __init__(self, file_name, flush_rows=100, flush_seconds=5.0, on_flush=None):
+        self.file_name = file_name
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.on_flush = on_flush
+        self._rows = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def write(self, row):
+        """Buffer one row (a dict), flushing if a threshold is reached."""
+        with self._lock:
+            self._rows.append(row)
+            if (
+                len(self._rows) >= self.flush_rows
+                or time.monotonic() - self._last_flush >= self.flush_seconds
+            ):
+                self._flush_locked()
+
+    def flush(self):
+        """Append all buffered rows to the file."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if self._rows:
+            append_records(self._rows, self.file_name)
+            if self.on_flush:
+                self.on_flush(self._rows)
+            self._rows = []
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,88 @@
+import gzip
+import hashlib
+import os
+import threading
+from pathlib import Path
+
+
+class TextCache:
+    """Content-addressed, gzip-compressed cache of text extracted from PDFs."""
+
+    def __init__(self, cache_folder, max_bytes, version):
+        """
+        Initialize the cache.
+
+        Args:
+        - cache_folder (str | Path): Directory holding the compressed entries.
+        - max_bytes (int): Total on-disk size after which the least recently
+          used entries are evicted.
+        - version (str): Extractor version mixed into every key, so changing
+          the extraction logic invalidates old entries.
+        """
+        self.cache_folder = Path(cache_folder)
+        self.max_bytes = max_bytes
+        self.version = version
+        self._lock = threading.Lock()
+        self.cache_folder.mkdir(parents=True, exist_ok=True)
+        self._total_bytes = sum(
+            entry_path.stat().st_size
+            for entry_path in self.cache_folder.glob("*.txt.gz")
+        )
+
+    def key_for(self, pdf_path):
+        """Return the cache key for a PDF: SHA-256 of its bytes plus the version."""
+        digest = hashlib.sha256()
+        with open(pdf_path, "rb") as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(chunk)
+        digest.update(self.version.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _entry_path(self, key):
+        return self.cache_folder / f"{key}.txt.gz"
+
+    def get(self, key):
+        """Return the cached text for `key`, or None on a miss."""
+        entry_path = self._entry_path(key)
+        try:
+            with gzip.open(entry_path, "rt", encoding="utf-8") as file:
+                text = file.read()
+        except (FileNotFoundError, OSError, EOFError):
+            return None
+        # Bump the modification time so eviction treats the entry as recently used
+        os.utime(entry_path)
+        return text
+
+    def put(self, key, text):
+        """Store `text` under `key` and evict old entries if over budget."""
+        entry_path = self._entry_path(key)
+        part_path = entry_path.with_suffix(".part")
+        with gzip.open(part_path, "wt", encoding="utf-8") as file:
+            file.write(text)
+        with self._lock:
+            if entry_path.exists():
+                self._total_bytes -= entry_path.stat().st_size
+            os.replace(part_path, entry_path)
+            self._total_bytes += entry_path.stat().st_size
+            over_budget = self._total_bytes > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits `max_bytes`."""
+        with self._lock:
+            entries = []
+            for entry_path in self.cache_folder.glob("*.txt.gz"):
+                try:
+                    stat = entry_path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry_path))
+
+            total_bytes = sum(size for _, size, _ in entries)
+            for _, size, entry_path in sorted(entries):
+                if total_bytes <= self.max_bytes:
+                    break
+                entry_path.unlink(missing_ok=True)
+                total_bytes -= size
+            self._total_bytes = total_bytes
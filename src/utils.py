@@ -12,11 +12,23 @@ def load_env_var(var_name):
 
 
 def save_to_csv(data, file_name):
-    """Save data to a CSV file, appending if the file already exists."""
+    """
+    Save data to a CSV file, appending if the file already exists.
+
+    Rows are appended under the existing header without re-reading the file,
+    so the cost of a write no longer grows with the size of the file.
+    """
     df = pd.DataFrame(data)
-    if not os.path.exists(file_name):
+    if df.empty and not len(df.columns):
+        return
+    if not os.path.exists(file_name) or os.path.getsize(file_name) == 0:
         df.to_csv(file_name, index=False)
-    else:
-        existing_df = pd.read_csv(file_name)
-        combined_df = pd.concat([existing_df, df], ignore_index=True)
-        combined_df.to_csv(file_name, index=False)
+        return
+
+    columns = pd.read_csv(file_name, nrows=0).columns
+    extra_columns = [column for column in df.columns if column not in columns]
+    if extra_columns:
+        print(
+            f"Warning: dropping columns not in {file_name}: {', '.join(extra_columns)}"
+        )
+    df.reindex(columns=columns).to_csv(file_name, mode="a", header=False, index=False)
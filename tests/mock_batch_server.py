@@ -0,0 +1,127 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MockBatchServer:
+    """
+    Minimal stand-in for the OpenAI files and batches endpoints.
+
+    Every uploaded request is answered with the JSON from `respond(request)`,
+    and a batch completes as soon as it is created. Point `llm.base_url` at
+    `url` to use it.
+    """
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.files = {}
+        self.batches = {}
+        self.requests = []
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        host, port = self._server.server_address
+        self.url = f"http://{host}:{port}/v1"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _complete(self, batch_id, input_file_id):
+        lines = []
+        for line in self.files[input_file_id].splitlines():
+            if not line.startswith(b'{"custom_id"'):
+                continue
+            request = json.loads(line)
+            self.requests.append(request)
+            content = json.dumps(self.respond(request))
+            lines.append(
+                json.dumps(
+                    {
+                        "id": f"response-{request['custom_id']}",
+                        "custom_id": request["custom_id"],
+                        "response": {
+                            "status_code": 200,
+                            "body": {
+                                "choices": [{"message": {"content": content}}],
+                                "usage": {
+                                    "prompt_tokens": 10,
+                                    "completion_tokens": 5,
+                                    "total_tokens": 15,
+                                },
+                            },
+                        },
+                        "error": None,
+                    }
+                )
+            )
+        output_file_id = f"file-output-{batch_id}"
+        self.files[output_file_id] = "\n".join(lines).encode("utf-8")
+        self.batches[batch_id] = {
+            "id": batch_id,
+            "object": "batch",
+            "endpoint": "/v1/chat/completions",
+            "completion_window": "24h",
+            "created_at": 0,
+            "input_file_id": input_file_id,
+            "output_file_id": output_file_id,
+            "status": "completed",
+            "request_counts": {
+                "completed": len(lines),
+                "failed": 0,
+                "total": len(lines),
+            },
+        }
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, body, content_type="application/json"):
+                if not isinstance(body, bytes):
+                    body = json.dumps(body).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                if self.path == "/v1/files":
+                    file_id = f"file-{len(server.files)}"
+                    server.files[file_id] = body
+                    self._send(
+                        {
+                            "id": file_id,
+                            "object": "file",
+                            "bytes": len(body),
+                            "created_at": 0,
+                            "filename": "requests.jsonl",
+                            "purpose": "batch",
+                            "status": "processed",
+                        }
+                    )
+                elif self.path == "/v1/batches":
+                    batch_id = f"batch-{len(server.batches)}"
+                    server._complete(batch_id, json.loads(body)["input_file_id"])
+                    self._send(server.batches[batch_id])
+                else:
+                    self.send_error(404)
+
+            def do_GET(self):
+                parts = self.path.strip("/").split("/")
+                if parts[1:2] == ["batches"] and parts[2] in server.batches:
+                    self._send(server.batches[parts[2]])
+                elif parts[1:2] == ["files"] and parts[3:] == ["content"]:
+                    self._send(server.files[parts[2]], "application/octet-stream")
+                else:
+                    self.send_error(404)
+
+        return Handler
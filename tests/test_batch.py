@@ -0,0 +1,87 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.knowledge_extractor import PROMPT_HASH, KnowledgeExtractor
+from src.response_cache import hash_text
+from tests.mock_batch_server import MockBatchServer
+
+TEXTS = {
+    "paper_a": "Intrusion detection with random forests on NSL-KDD.",
+    "paper_b": "A survey of anomaly-based network intrusion detection.",
+}
+
+
+def respond(request):
+    paper_id = request["custom_id"].split("#")[0]
+    return {"title": paper_id.replace("_", " "), "keywords": ["ids"]}
+
+
+@pytest.fixture
+def server():
+    with MockBatchServer(respond) as server:
+        yield server
+
+
+@pytest.fixture
+def extractor(tmp_path, monkeypatch, server):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    pdf_folder = tmp_path / "pdfs"
+    pdf_folder.mkdir()
+    for paper_id in TEXTS:
+        (pdf_folder / f"{paper_id}.pdf").write_bytes(b"%PDF-1.4\n")
+    config = {
+        "download": {"pdf_folder": str(pdf_folder)},
+        "llm": {
+            "model": "gpt-4o",
+            "base_url": server.url,
+            "output_folder": str(tmp_path / "llm_responses"),
+            "merged_responses_file": str(tmp_path / "llm_responses.json"),
+            "batch_folder": str(tmp_path / "batches"),
+            "batch_poll_interval": 0,
+            "text_cache_folder": str(tmp_path / "text_cache"),
+            "response_cache_file": str(tmp_path / "llm_cache.sqlite"),
+        },
+    }
+    extractor = KnowledgeExtractor(config)
+    # Skip PDF parsing: the batch flow only needs the text
+    monkeypatch.setattr(
+        extractor,
+        "_collect_texts",
+        lambda pdf_files: [(path, TEXTS[Path(path).stem]) for path in pdf_files],
+    )
+    yield extractor
+    extractor.response_cache.close()
+
+
+def test_batch_round_trip(extractor, server, tmp_path):
+    batch_id = extractor.submit_batch()
+    assert {request["custom_id"] for request in server.requests} == {
+        "paper_a#0",
+        "paper_b#0",
+    }
+
+    assert extractor.poll_batch(batch_id).status == "completed"
+    extractor.ingest_batch(batch_id)
+
+    for paper_id in TEXTS:
+        with open(tmp_path / "llm_responses" / f"{paper_id}.json") as f:
+            assert json.load(f)["title"] == paper_id.replace("_", " ")
+    with open(tmp_path / "llm_responses.json") as f:
+        merged = json.load(f)
+    assert [response["paper_id"] for response in merged] == ["paper_a", "paper_b"]
+
+    # Every response is cached now, so there is nothing left to submit
+    assert extractor.submit_batch() is None
+
+
+def test_ingest_caches_under_submitted_model(extractor):
+    batch_id = extractor.submit_batch()
+    extractor.model = "gpt-4o-mini"
+    extractor.ingest_batch(batch_id)
+
+    text_hash = hash_text(TEXTS["paper_a"])
+    cache = extractor.response_cache
+    assert cache.peek("gpt-4o", PROMPT_HASH, text_hash) is not None
+    assert cache.peek("gpt-4o-mini", PROMPT_HASH, text_hash) is None
@@ -0,0 +1,50 @@
+from src.dedup import Deduplicator
+
+ABSTRACT = (
+    "Three-way decisions divide a universe into positive, negative and boundary "
+    "regions and make acceptance, rejection and deferment decisions accordingly."
+)
+
+
+def test_title_only_results_need_an_exact_match():
+    dedup = Deduplicator()
+    titles = [
+        "A comprehensive survey of deep learning based intrusion detection, Part I",
+        "A comprehensive survey of deep learning based intrusion detection, Part II",
+        "Lightweight anomaly-based intrusion detection for IoT networks",
+        "Lightweight anomaly-based intrusion detection for SDN networks",
+    ]
+    assert all(dedup.add({"Title": title})[1] for title in titles)
+    assert not dedup.add({"Title": titles[0].upper()})[1]
+    assert dedup.duplicates == 1
+
+
+def test_near_duplicates_with_abstracts_are_merged():
+    dedup = Deduplicator()
+    first = {
+        "Title": "Three-way decisions with probabilistic rough sets",
+        "Abstract": ABSTRACT,
+        "URL": "https://example.org/landing",
+    }
+    second = {
+        "Title": "Three way decisions with probabilistic rough sets.",
+        "Abstract": ABSTRACT + " …",
+        "URL": "https://example.org/yao2010.pdf",
+    }
+    assert dedup.add(first)[1]
+    canonical, is_new = dedup.add(second)
+    assert not is_new
+    assert canonical["URL"] == "https://example.org/yao2010.pdf"
+
+
+def test_different_abstracts_keep_series_parts_apart():
+    dedup = Deduplicator()
+    title = "A comprehensive survey of deep learning based intrusion detection"
+    assert dedup.add({"Title": f"{title}, Part I", "Abstract": ABSTRACT})[1]
+    assert dedup.add(
+        {
+            "Title": f"{title}, Part II",
+            "Abstract": "The second part reviews datasets, evaluation metrics and "
+            "open problems of deep intrusion detection systems in practice.",
+        }
+    )[1]
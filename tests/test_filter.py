@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+
+from src.filter import PaperFilter, _synthetic_papers
+
+
+def make_filter(mode, expression=None):
+    keywords = ["three", "3", "3wd", "twd", "three way"]
+    return PaperFilter(
+        {
+            "output": {"filtered_results_file": None},
+            "search": {
+                "filter": {
+                    "keywords": {"title": keywords, "abstract": ["3", "twd"]},
+                    "mode": mode,
+                    "expression": expression,
+                }
+            },
+        }
+    )
+
+
+@pytest.mark.parametrize("mode", ["substring", "word", "phrase"])
+@pytest.mark.parametrize("expression", [None, '("three way" OR 3wd) AND NOT twd'])
+def test_filter_frame_agrees_with_matcher(mode, expression):
+    paper_filter = make_filter(mode, expression)
+    papers = _synthetic_papers(2000, hit_rate=0.3) + [
+        {"Title": "A Three-Way Decision Model", "Abstract": "three way 3wd"},
+        {"Title": None, "Abstract": "TWD in 2023"},
+    ]
+    df = pd.DataFrame(papers)
+
+    filtered = paper_filter.filter_frame(df)
+    matches = [paper_filter.matcher.match(paper) for paper in papers]
+    assert list(filtered.index) == [i for i, m in enumerate(matches) if m["matched"]]
+    for i, row in filtered.iterrows():
+        match = matches[i]
+        assert row["Keywords Matched"] == ", ".join(match["keywords"])
+        for field, column in (("title", "Title"), ("abstract", "Abstract")):
+            found = sorted({kw for kw, _, _ in match["positions"][field]})
+            assert row[f"{column} Keywords Matched"] == ", ".join(found)
+
+
+@pytest.mark.parametrize("mode", ["word", "phrase"])
+def test_unicode_whitespace_and_boundaries(mode):
+    paper_filter = make_filter(mode)
+    papers = [
+        {"Title": "three\xa0way decisions", "Abstract": ""},
+        {"Title": "three way", "Abstract": "twd　model"},
+        {"Title": "Café3 results", "Abstract": "é3"},
+        {"Title": "Modèle 3", "Abstract": ""},
+        {"Title": "ΤΡΙΑ three", "Abstract": ""},
+    ]
+    filtered = paper_filter.filter_frame(pd.DataFrame(papers))
+    expected = [
+        i
+        for i, paper in enumerate(papers)
+        if paper_filter.matcher.match(paper)["matched"]
+    ]
+    assert list(filtered.index) == expected
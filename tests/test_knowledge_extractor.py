@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from src.knowledge_extractor import KnowledgeExtractor
+
+# Long enough that the References heading is past the first third of the text
+TEXT = (
+    "Intrusion detection with random forests on NSL-KDD.\n"
+    + "We evaluate tree ensembles on network traffic.\n" * 20
+    + "References\n"
+    + "[1] L. Breiman. Random forests. Machine Learning, 2001.\n"
+)
+
+SAVED = {"title": "Intrusion detection with random forests", "keywords": ["ids"]}
+
+
+@pytest.fixture
+def extractor(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    pdf_folder = tmp_path / "pdfs"
+    pdf_folder.mkdir()
+    config = {
+        "download": {"pdf_folder": str(pdf_folder)},
+        "llm": {
+            "output_folder": str(tmp_path / "llm_responses"),
+            "merged_responses_file": str(tmp_path / "llm_responses.json"),
+            "text_cache_folder": str(tmp_path / "text_cache"),
+            "response_cache_file": str(tmp_path / "llm_cache.sqlite"),
+        },
+    }
+    extractor = KnowledgeExtractor(config)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("the API must not be called for a saved response")
+
+    monkeypatch.setattr(extractor, "generate_structured_json", fail)
+    monkeypatch.setattr(extractor, "agenerate_structured_json", fail)
+    yield extractor
+    extractor.response_cache.close()
+
+
+def test_saved_response_is_reused_across_runs(extractor, tmp_path):
+    pdf_path = tmp_path / "pdfs" / "paper_a.pdf"
+    output_file = tmp_path / "llm_responses" / "paper_a.json"
+    output_file.write_text(json.dumps(SAVED), encoding="utf-8")
+
+    # The first run seeds the cache, the second must find it there even though
+    # the chunk sent to the API has the bibliography stripped
+    assert extractor.process_text(pdf_path, TEXT) == SAVED
+    assert extractor.process_text(pdf_path, TEXT) == SAVED
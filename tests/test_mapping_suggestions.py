@@ -0,0 +1,57 @@
+from collections import Counter
+from itertools import combinations
+
+import pytest
+
+from src.mapping_suggestions import similar_pairs, suggest_mappings, trigrams
+
+KEYS = [
+    "randomforest",
+    "randomforests",
+    "randomforestclassifier",
+    "supportvectormachine",
+    "supportvectormachines",
+    "svm",
+    "nslkdd",
+    "nslkdd99",
+    "kddcup99",
+    "cicids2017",
+    "cicids2018",
+]
+
+
+def jaccard(a, b):
+    a, b = trigrams(a), trigrams(b)
+    return len(a & b) / len(a | b)
+
+
+@pytest.mark.parametrize("threshold", [0.3, 0.5, 0.6, 0.7])
+def test_similar_pairs_matches_brute_force(threshold):
+    expected = {
+        (i, j)
+        for i, j in combinations(range(len(KEYS)), 2)
+        if jaccard(KEYS[i], KEYS[j]) >= threshold
+    }
+    pairs = similar_pairs(KEYS, threshold)
+    assert all(i < j for i, j in pairs)
+    assert set(pairs) == expected
+
+
+def test_suggest_mappings_picks_canonical_value():
+    counts = Counter(
+        {
+            "Random Forest": 5,
+            "random forests": 2,
+            "Random-Forest": 1,
+            "NSL-KDD": 3,
+            "NSLKDD": 3,
+            "SVM": 4,
+        }
+    )
+    assert suggest_mappings(counts, threshold=0.7) == {
+        # The most frequent value wins; "Random-Forest" shares its lookup key
+        "random forests": "random forest",
+        "random-forest": "random forest",
+        # On equal counts the shorter value wins
+        "nsl-kdd": "nslkdd",
+    }
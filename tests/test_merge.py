@@ -0,0 +1,92 @@
+import pytest
+
+from src.merge import ResponseMerger, merge_results, title_hash
+from src.storage import read_records, write_records
+
+SEARCH_RESULTS = [
+    {"paper_id": "yao2010", "Title": "Three-way decisions with rough sets"},
+    {"paper_id": "smith2019", "Title": "A Survey of Three-Way Classification."},
+    {"paper_id": "lee2021", "Title": "Sequential three-way decisions for IDS"},
+    {"paper_id": "chen2022", "Title": "Graph neural networks for malware"},
+]
+
+RESPONSES = [
+    {"paper_id": "yao2010", "title": "Three-way decisions (extracted)"},
+    {"paper_id": "other", "title": "a survey of three way classification"},
+    {"paper_id": "lee", "title": "Sequential three-way decision for IDS"},
+]
+
+
+def test_title_hash_normalizes():
+    assert title_hash("A Survey of IDS.") == title_hash("a survey of ids")
+    assert title_hash("") is None
+    assert title_hash(None) is None
+
+
+def test_match_methods_and_confidence():
+    matches = ResponseMerger(threshold=0.8).match(SEARCH_RESULTS, RESPONSES)
+
+    assert matches[0] == (0, "paper_id", 1.0)
+    assert matches[1] == (1, "title", 1.0)
+    position, method, confidence = matches[2]
+    assert (position, method) == (2, "fuzzy")
+    assert 0.8 <= confidence < 1.0
+    assert matches[3] == (None, None, None)
+
+
+def test_fuzzy_match_assigns_each_response_once():
+    search_results = [
+        {"Title": "Sequential three-way decision for IDS (preprint)"},
+        {"Title": "Sequential three-way decisions for IDS"},
+    ]
+    responses = [{"title": "Sequential three-way decision for IDS"}]
+
+    matches = ResponseMerger(threshold=0.5).match(search_results, responses)
+
+    # Both titles are similar enough, but only the closer one gets the response
+    assert matches[0] == (None, None, None)
+    assert matches[1][:2] == (0, "fuzzy")
+
+
+def test_merge_keeps_every_search_result():
+    merged, unmatched = ResponseMerger().merge(SEARCH_RESULTS, RESPONSES)
+
+    assert [record["paper_id"] for record in merged] == [
+        "yao2010",
+        "smith2019",
+        "lee2021",
+        "chen2022",
+    ]
+    # Search result fields win over the response's
+    assert merged[1]["paper_id"] == "smith2019"
+    assert merged[0]["title"] == "Three-way decisions (extracted)"
+    assert merged[3]["title"] == "Graph neural networks for malware"
+    assert merged[3]["match_confidence"] is None
+    assert unmatched == []
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".parquet"])
+def test_merge_results_writes_output(tmp_path, suffix):
+    if suffix == ".parquet":
+        pytest.importorskip("pyarrow")
+    write_records(SEARCH_RESULTS, str(tmp_path / "search_results.json"))
+    write_records(
+        RESPONSES + [{"title": "Unrelated paper"}], str(tmp_path / "responses.json")
+    )
+    output_file = str(tmp_path / f"merged_results{suffix}")
+    config = {
+        "search": {"output": str(tmp_path / "search_results.json")},
+        "llm": {"merged_responses_file": str(tmp_path / "responses.json")},
+        "analysis": {"merged_results_file": output_file},
+    }
+
+    merged = merge_results(config)
+
+    records = read_records(output_file)
+    assert len(records) == len(merged) == len(SEARCH_RESULTS)
+    assert [record["match_method"] for record in records] == [
+        "paper_id",
+        "title",
+        "fuzzy",
+        None,
+    ]
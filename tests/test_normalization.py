@@ -0,0 +1,35 @@
+from src.normalization import Normalizer, compile_mappings
+
+MAPPINGS = {
+    "datasets": {"NSL KDD": "NSL-KDD", "KDD Cup 99": "KDD99"},
+    "attack_types": {"DDoS attack": "DDoS"},
+}
+
+
+def test_normalize_corpus():
+    papers = [
+        {
+            "datasets": ["nsl-kdd", "NSL KDD", "CICIDS2017", "kdd cup 99"],
+            "keywords": "intrusion detection",
+            "intrusion_detection_systems": {"attack_types": ["DDoS attacks"]},
+        }
+    ]
+    stats = Normalizer(compile_mappings(MAPPINGS)).normalize_corpus(papers)
+
+    assert papers[0]["datasets"] == ["nsl-kdd", "CICIDS2017", "kdd99"]
+    assert papers[0]["intrusion_detection_systems"]["attack_types"] == ["ddos"]
+    assert papers[0]["keywords"] == "intrusion detection"
+    assert stats["exact"] == 3
+
+
+def test_non_string_list_items_pass_through():
+    papers = [
+        {
+            "datasets": [{"name": "NSL KDD"}, "NSL KDD", None, 3, "nsl kdd"],
+            "authors": [["A Author"]],
+        }
+    ]
+    Normalizer(compile_mappings(MAPPINGS)).normalize_corpus(papers)
+
+    assert papers[0]["datasets"] == [{"name": "NSL KDD"}, "nsl-kdd", None, 3]
+    assert papers[0]["authors"] == [["A Author"]]
@@ -0,0 +1,71 @@
+import json
+import os
+
+import pytest
+
+from src import report
+
+pytest.importorskip("matplotlib")
+
+PAPERS = [
+    {"title": "Paper A", "keywords": ["ids", "ml"], "year": 2020, "Citations": 5},
+    {"title": "Paper B", "keywords": ["ids"], "year": 2021, "Citations": "N/A"},
+]
+
+
+@pytest.fixture
+def config(tmp_path):
+    with open(tmp_path / "cleaned.json", "w") as f:
+        json.dump(PAPERS, f)
+    return {
+        "analysis": {
+            "cleaned_results_file": str(tmp_path / "cleaned.json"),
+            "report_summary_file": str(tmp_path / "summary.json"),
+            "report_folder": str(tmp_path / "report"),
+        }
+    }
+
+
+def test_report_skips_unchanged_corpus(config, monkeypatch, capsys):
+    summary = report.build_report(config)
+    assert summary.counts["keywords"] == {"ids": 2, "ml": 1}
+    assert summary.top_cited(3) == [("Paper A", 5)]
+
+    def fail(path):
+        raise AssertionError("an unchanged corpus must not be read")
+
+    monkeypatch.setattr(report, "read_records", fail)
+    summary = report.build_report(config)
+    assert "up to date" in capsys.readouterr().out
+    assert summary.counts["keywords"] == {"ids": 2, "ml": 1}
+
+
+def test_report_applies_changes(config):
+    report.build_report(config)
+    with open(config["analysis"]["cleaned_results_file"], "w") as f:
+        json.dump([PAPERS[0], {**PAPERS[1], "keywords": ["svm", "rf"]}], f)
+
+    summary = report.build_report(config)
+    assert summary.counts["keywords"] == {"ids": 1, "ml": 1, "svm": 1, "rf": 1}
+
+
+def test_report_notices_replaced_corpus_with_same_size_and_mtime(config):
+    report.build_report(config)
+    input_file = config["analysis"]["cleaned_results_file"]
+    mtime_ns = os.stat(input_file).st_mtime_ns
+    # Same length, different keyword; written atomically as --normalize does
+    with open(input_file + ".tmp", "w") as f:
+        json.dump([PAPERS[0], {**PAPERS[1], "keywords": ["svm"]}], f)
+    os.replace(input_file + ".tmp", input_file)
+    os.utime(input_file, ns=(mtime_ns, mtime_ns))
+
+    summary = report.build_report(config)
+    assert summary.counts["keywords"] == {"ids": 1, "ml": 1, "svm": 1}
+
+
+def test_report_rebuild_reads_unchanged_corpus(config, capsys):
+    report.build_report(config)
+    capsys.readouterr()
+
+    report.build_report(config, rebuild=True)
+    assert "up to date" not in capsys.readouterr().out
@@ -0,0 +1,178 @@
+from pathlib import Path
+
+import pytest
+
+from src.search import PaperSearch
+from src.search_backends import (
+    BLOCKED_SELECTOR,
+    SearchBackend,
+    SeleniumBackend,
+    is_blocked_page,
+    parse_authors_and_year,
+    parse_results_html,
+)
+
+lxml_html = pytest.importorskip("lxml.html")
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def read_fixture(name):
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize(
+    "byline, expected",
+    [
+        ("Y Yao - Information sciences, 2010 - Elsevier", ("Y Yao", "2010")),
+        ("Y Yao\xa0- Information sciences, 2010\xa0- Elsevier", ("Y Yao", "2010")),
+        (
+            "J Smith,\xa0K Lee\xa0- Knowledge-Based Systems, 2019\xa0- Elsevier",
+            ("J Smith, K Lee", "2019"),
+        ),
+        ("A Author - Proc. 2021 Workshop, 2022 - example.com", ("A Author", "2022")),
+        ("A Author - example.com", ("A Author", "N/A")),
+        ("", ("N/A", "N/A")),
+    ],
+)
+def test_parse_authors_and_year(byline, expected):
+    assert parse_authors_and_year(byline) == expected
+
+
+def test_parse_results_html():
+    results = parse_results_html(read_fixture("scholar_results.html"))
+
+    # The [CITATION] block has no title link and is skipped
+    assert [result["title"] for result in results] == [
+        "Three-way decisions with probabilistic rough sets",
+        "A survey of three-way classification",
+        "Sequential three-way decision without a snippet",
+    ]
+    first, second, third = results
+    assert first["url"] == "https://example.org/yao2010.pdf"
+    assert (first["authors"], first["year"]) == ("Y Yao", "2010")
+    assert first["abstract"].startswith("The rough set theory approximates")
+    assert second["url"].startswith("https://scholar.google.com/citations?")
+    assert (second["authors"], second["year"]) == ("J Smith, K Lee, M Chen", "2019")
+    assert (third["year"], third["abstract"]) == ("N/A", "")
+
+
+def test_captcha_page():
+    html = read_fixture("scholar_captcha.html")
+    assert is_blocked_page(html)
+    assert parse_results_html(html) == []
+    assert not is_blocked_page(read_fixture("scholar_results.html"))
+
+
+def test_results_mentioning_unusual_traffic_are_not_blocked():
+    html = read_fixture("scholar_results.html").replace(
+        "The rough set theory approximates",
+        "Detecting unusual traffic with a captcha. The rough set theory approximates",
+    )
+    assert "unusual traffic" in html
+    assert not is_blocked_page(html)
+    assert len(parse_results_html(html)) == 3
+
+
+class FixtureBackend(SearchBackend):
+    """Serves the fixture page for the first `pages` offsets, then nothing."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.starts = []
+
+    def fetch_page(self, query, start=0):
+        self.starts.append(start)
+        if len(self.starts) > self.pages:
+            return []
+        return parse_results_html(read_fixture("scholar_results.html"))
+
+
+def test_iter_pages_advances_by_page_size(tmp_path):
+    config = {
+        "search": {
+            "output": str(tmp_path / "search_results.csv"),
+            "max_results": 100,
+            "delay": 0,
+            "backend": "http",
+            "checkpoint_file": str(tmp_path / "checkpoint.json"),
+            "filter": {"keywords": {"title": ["three-way"], "abstract": []}},
+        },
+        "download": {"pdf_folder": str(tmp_path / "pdfs")},
+        "output": {"status_file": str(tmp_path / "status.json")},
+    }
+    searcher = PaperSearch(config)
+    searcher.backend = FixtureBackend(pages=3)
+
+    pages = [(start, next_start) for start, next_start, _ in searcher.iter_pages("q")]
+    assert pages == [(0, 10), (10, 20), (20, 30)]
+    assert searcher.backend.starts == [0, 10, 20, 30]
+
+
+def test_search_backend_is_abstract():
+    with pytest.raises(TypeError):
+        SearchBackend()
+
+
+class FixtureDriver:
+    """Stands in for a WebDriver that always shows one saved page."""
+
+    def __init__(self, html):
+        self.html = html
+        self.tree = lxml_html.fromstring(html)
+        self.page_source_reads = 0
+
+    @property
+    def page_source(self):
+        self.page_source_reads += 1
+        return self.html
+
+    def get(self, url):
+        pass
+
+    def find_elements(self, by, selector):
+        assert selector == BLOCKED_SELECTOR
+        return self.tree.xpath("//*[@id='gs_captcha_ccl' or @id='captcha-form']")
+
+    def execute_script(self, script, selector):
+        rows = []
+        for block in self.tree.xpath("//div[@class='gs_ri']"):
+            links = block.xpath(".//h3//a")
+            byline = block.xpath(".//div[@class='gs_a']")
+            snippet = block.xpath(".//div[@class='gs_rs']")
+            rows.append(
+                {
+                    "title": links[0].text_content().strip() if links else None,
+                    "url": links[0].get("href") if links else None,
+                    "byline": byline[0].text_content().strip() if byline else "",
+                    "abstract": snippet[0].text_content().strip() if snippet else "",
+                }
+            )
+        return {"blocked": bool(self.find_elements(None, selector)), "rows": rows}
+
+
+@pytest.mark.parametrize("extraction", ["page_source", "script", "elements"])
+def test_selenium_backend_raises_on_captcha(extraction):
+    backend = SeleniumBackend(
+        {"search": {"page_load_wait": 0, "selenium_extraction": extraction}}
+    )
+    backend.driver = FixtureDriver(read_fixture("scholar_captcha.html"))
+    with pytest.raises(RuntimeError, match="CAPTCHA"):
+        backend.fetch_page("q")
+    # Only the page_source mode pays for transferring the whole page
+    assert backend.driver.page_source_reads == (extraction == "page_source")
+
+
+@pytest.mark.parametrize("extraction", ["page_source", "script"])
+def test_selenium_backend_extracts_results(extraction):
+    backend = SeleniumBackend(
+        {"search": {"page_load_wait": 0, "selenium_extraction": extraction}}
+    )
+    backend.driver = FixtureDriver(read_fixture("scholar_results.html"))
+    results = backend.fetch_page("q")
+    assert [result["title"] for result in results] == [
+        result["title"]
+        for result in parse_results_html(read_fixture("scholar_results.html"))
+    ]
+    authors_and_year = (results[1]["authors"], results[1]["year"])
+    assert authors_and_year == ("J Smith, K Lee, M Chen", "2019")
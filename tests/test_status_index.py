@@ -0,0 +1,29 @@
+from src.status_index import StatusIndex
+from src.storage import append_records
+
+
+def test_increment_seeds_missing_stage_from_disk(tmp_path):
+    results = str(tmp_path / "results.csv")
+    append_records([{"Title": "A"}, {"Title": "B"}], results)
+    index = StatusIndex(str(tmp_path / "status.json"))
+
+    # The new row is already on disk when the writer reports it
+    append_records([{"Title": "C"}], results)
+    index.increment("search_results", 1, path=results)
+    assert index.load()["search_results"]["count"] == 3
+
+    append_records([{"Title": "D"}], results)
+    index.increment("search_results", 1, path=results)
+    assert index.load()["search_results"]["count"] == 4
+
+
+def test_increment_seeds_folder_stage(tmp_path):
+    folder = tmp_path / "pdfs"
+    folder.mkdir()
+    for name in ("a.pdf", "b.pdf", "c.pdf.part"):
+        (folder / name).write_bytes(b"%PDF")
+    index = StatusIndex(str(tmp_path / "status.json"))
+
+    index.increment("papers", 1, size=4, path=str(folder), suffix=".pdf")
+    entry = index.load()["papers"]
+    assert (entry["count"], entry["bytes"]) == (2, 8)
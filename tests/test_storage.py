@@ -0,0 +1,55 @@
+import pytest
+
+from src.storage import append_records, ensure_columns, read_records, read_table
+
+pytest.importorskip("pyarrow")
+
+
+def test_parquet_appends_with_conflicting_types(tmp_path):
+    path = str(tmp_path / "results.parquet")
+    append_records([{"Title": "A", "Citations": 12, "year": 2020}], path)
+    append_records([{"Title": "B", "Citations": "N/A", "year": 2021.0}], path)
+    append_records([{"Title": "C", "Citations": 3, "year": None}], path)
+
+    records = read_records(path)
+    by_title = {record["Title"]: record for record in records}
+    assert by_title["B"]["Citations"] == "N/A"
+    assert str(by_title["A"]["Citations"]) == "12"
+    assert by_title["B"]["year"] == 2021
+    assert by_title["C"]["year"] is None
+
+
+def test_parquet_json_column_appends(tmp_path):
+    path = str(tmp_path / "responses.parquet")
+    append_records([{"paper_id": "a", "keywords": "ids"}], path)
+    append_records([{"paper_id": "b", "keywords": ["ids", "ml"]}], path)
+    append_records([{"paper_id": "c", "keywords": "svm"}], path)
+
+    keywords = {
+        record["paper_id"]: record["keywords"] for record in read_records(path)
+    }
+    assert keywords == {"a": "ids", "b": ["ids", "ml"], "c": "svm"}
+
+
+def test_parquet_filters_on_numeric_column(tmp_path):
+    path = str(tmp_path / "results.parquet")
+    append_records([{"Title": "A", "Citations": 12}], path)
+    append_records([{"Title": "B", "Citations": 3.5}], path)
+
+    df = read_table(path, filters=[("Citations", ">=", 10)])
+    assert list(df["Title"]) == ["A"]
+
+
+def test_ensure_columns_extends_csv_header(tmp_path):
+    path = str(tmp_path / "search_results.csv")
+    append_records(
+        [{"Title": "A", "Citations": "N/A", "Publication Year": "2020"}], path
+    )
+
+    ensure_columns(path, ["Title", "Query"])
+    append_records([{"Title": "B", "Query": "three way"}], path)
+
+    assert [record["Query"] for record in read_records(path)] == [None, "three way"]
+    with open(path) as f:
+        assert f.readline().strip() == "Title,Citations,Publication Year,Query"
+        assert f.readline().strip() == "A,N/A,2020,"